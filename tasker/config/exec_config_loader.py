@@ -18,6 +18,8 @@ import sys
 import platform
 import shlex
 import shutil
+import inspect
+import weakref
 
 # Try to import YAML, fall back gracefully if not available
 try:
@@ -27,6 +29,14 @@ except ImportError:
     YAML_AVAILABLE = False
     yaml = None
 
+# Parsed config files, keyed by absolute path: (mtime_ns, size), config_data
+# Reloading the loader re-parses a file only when it changed on disk
+_parsed_config_cache = {}
+
+
+def _noop_debug_callback(msg):
+    """Debug callback used when none is set."""
+
 
 class ExecConfigLoader:
     """
@@ -46,7 +56,7 @@ class ExecConfigLoader:
             config_path: Optional explicit path to config file
             debug_callback: Optional callback for debug messages
         """
-        self.debug_callback = debug_callback or (lambda msg: None)
+        self.debug_callback = debug_callback or _noop_debug_callback
         self.config_path = config_path
         self.config_data = None
         self.platform = self._detect_platform()
@@ -56,6 +66,21 @@ class ExecConfigLoader:
         # Load configuration
         self._load_config()
 
+    @property
+    def debug_callback(self):
+        """Current debug callback, or a no-op once a weakly held owner is gone."""
+        callback = self._debug_callback_ref()
+        return callback if callback is not None else _noop_debug_callback
+
+    @debug_callback.setter
+    def debug_callback(self, debug_callback):
+        # Bound methods are held weakly so the singleton does not keep their
+        # owner (e.g. a finished TaskExecutor) alive
+        if inspect.ismethod(debug_callback):
+            self._debug_callback_ref = weakref.WeakMethod(debug_callback)
+        else:
+            self._debug_callback_ref = lambda: debug_callback
+
     def set_debug_callback(self, debug_callback):
         """
         Update the debug callback for this loader instance.
@@ -66,7 +91,16 @@ class ExecConfigLoader:
         Args:
             debug_callback: New debug callback function or None
         """
-        self.debug_callback = debug_callback or (lambda msg: None)
+        self.debug_callback = debug_callback or _noop_debug_callback
+
+    def clear_debug_callback(self):
+        """
+        Drop the current debug callback.
+
+        Called when the owner of the callback is done with the loader, so the
+        singleton no longer keeps that owner (e.g. a TaskExecutor) alive.
+        """
+        self.set_debug_callback(None)
 
     def _detect_platform(self):
         """
@@ -179,8 +213,15 @@ class ExecConfigLoader:
 
         # Load and parse YAML
         try:
-            with open(config_file, 'r') as f:
-                self.config_data = yaml.safe_load(f)
+            config_file = os.path.abspath(config_file)
+            file_stat = os.stat(config_file)
+            file_signature = (file_stat.st_mtime_ns, file_stat.st_size)
+            cached = _parsed_config_cache.get(config_file)
+            if cached is not None and cached[0] == file_signature:
+                self.config_data = cached[1]
+            else:
+                with open(config_file, 'r') as f:
+                    self.config_data = yaml.safe_load(f)
 
             # Validate basic structure
             if not isinstance(self.config_data, dict):
@@ -190,7 +231,8 @@ class ExecConfigLoader:
                 raise ValueError("Config file must contain 'platforms' key")
 
             # Store the successfully loaded config path
-            self.loaded_config_path = os.path.abspath(config_file)
+            self.loaded_config_path = config_file
+            _parsed_config_cache[config_file] = (file_signature, self.config_data)
             self.debug_callback(f"Successfully loaded config from: {self.loaded_config_path}")
 
         except Exception as e:
@@ -15,3 +15,8 @@ MAX_VARIABLE_EXPANSION_DEPTH = 10
 # Most OS have ARG_MAX limits between 128KB-2MB, so 100KB is a safe limit.
 # Used when substituting large outputs (≥1MB) stored in temp files into command arguments.
 MAX_CMDLINE_SUBST = 100 * 1024  # 100KB safe limit
+
+# Maximum number of validation errors reported for a task file
+# Per-task validation stops once this many errors are recorded, so badly broken
+# files fail fast instead of producing thousands of follow-up errors.
+MAX_VALIDATION_ERRORS = 50
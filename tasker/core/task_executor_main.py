@@ -60,6 +60,10 @@ from .result_collector import ResultCollector
 from .workflow_controller import WorkflowController
 from .task_runner import TaskRunner
 
+# Pre-compiled pattern for task result references (@N_stdout@, @N_stderr@, @N_success@, @N_exit@)
+# Only the task ID is captured; the result kind is not needed by the dependency checks
+_TASK_REFERENCE_PATTERN = re.compile(r'@(\d+)_(?:stdout|stderr|success|exit)@')
+
 
 class TaskExecutor:
     """
@@ -978,6 +982,11 @@ class TaskExecutor:
             except Exception as lock_cleanup_error:
                 cleanup_errors.append(f"Instance lock cleanup failed: {lock_cleanup_error}")
 
+        # Detach from the shared exec config loader unless a newer executor took it over
+        exec_config_loader = getattr(self, '_exec_config_loader', None)
+        if exec_config_loader is not None and exec_config_loader.debug_callback == self.log_debug:
+            exec_config_loader.clear_debug_callback()
+
         # PHASE 5: Error reporting
         if cleanup_errors:
             error_count = len(cleanup_errors)
@@ -1339,8 +1348,8 @@ class TaskExecutor:
                     self.log_error(error)
                 return False
             else:
-                # Log warnings if any
-                if result['warnings']:
+                # Log warnings if any (debug level only, so skip formatting them otherwise)
+                if result['warnings'] and self._should_log('DEBUG'):
                     for warning in result['warnings']:
                         self.log_debug(f"# WARNING: {warning}")
                 
@@ -1637,29 +1646,21 @@ class TaskExecutor:
     def validate_task_dependencies(self):
         """Validate that task dependencies can be resolved given the execution flow."""
         dependency_issues = []
-        pattern = r'@(\d+)_(stdout|stderr|success|exit)@'
-        
+
         for task_id, task in self.tasks.items():
-            # Check condition dependencies
-            if 'condition' in task:
-                matches = re.findall(pattern, task['condition'])
-                for dep_task_str, _ in matches:
-                    dep_task = int(dep_task_str)
-                    if dep_task not in self.tasks:
-                        dependency_issues.append(f"Task {task_id} condition references non-existent Task {dep_task}")
-                    elif dep_task >= task_id:
-                        dependency_issues.append(f"Task {task_id} condition references future Task {dep_task} - this may cause execution issues")
-            
-            # Check argument dependencies
-            if 'arguments' in task:
-                matches = re.findall(pattern, task['arguments'])
-                for dep_task_str, _ in matches:
-                    dep_task = int(dep_task_str)
+            # Check condition and argument dependencies
+            for field, references in (('condition', 'condition references'), ('arguments', 'arguments reference')):
+                value = task.get(field)
+                # A reference needs '@', so most values never reach the regex engine
+                if not value or '@' not in value:
+                    continue
+                for match in _TASK_REFERENCE_PATTERN.finditer(value):
+                    dep_task = int(match.group(1))
                     if dep_task not in self.tasks:
-                        dependency_issues.append(f"Task {task_id} arguments reference non-existent Task {dep_task}")
+                        dependency_issues.append(f"Task {task_id} {references} non-existent Task {dep_task}")
                     elif dep_task >= task_id:
-                        dependency_issues.append(f"Task {task_id} arguments reference future Task {dep_task} - this may cause execution issues")
-        
+                        dependency_issues.append(f"Task {task_id} {references} future Task {dep_task} - this may cause execution issues")
+
         if dependency_issues:
             self.log_info("# WARNING: Task dependency issues detected:")
             for issue in dependency_issues:
@@ -1682,9 +1683,9 @@ class TaskExecutor:
         self.log_info(f"# WARNING: Tasks before {start_task_id} will be skipped")
         
         # Check for potential dependency issues
-        skipped_tasks = [tid for tid in self.tasks.keys() if tid < start_task_id]
+        skipped_tasks = sorted(tid for tid in self.tasks if tid < start_task_id)
         if skipped_tasks:
-            self.log_info(f"# Skipped tasks: {sorted(skipped_tasks)}")
+            self.log_info(f"# Skipped tasks: {skipped_tasks}")
             self.log_info(f"# CAUTION: Task {start_task_id} may fail if it depends on skipped tasks")
         
         return True
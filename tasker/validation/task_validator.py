@@ -9,17 +9,137 @@ unused variable warnings, inline comment detection, PARALLEL TASKS, RETRY LOGIC,
 """
 import os
 import re
+import sys
 import ipaddress
+from collections import Counter, deque
 from .input_sanitizer import InputSanitizer
-from ..core.constants import MAX_VARIABLE_EXPANSION_DEPTH
+from ..core.constants import MAX_VARIABLE_EXPANSION_DEPTH, MAX_VALIDATION_ERRORS
 
 # Reserved ID range for auto-generated subtasks from hostnames= parameter
 # User-defined tasks must use IDs 0-99,999
 # Generated subtasks use IDs 100,000+
 RESERVED_SUBTASK_ID_START = 100000
 
+# Special task ID range exempt from gap/reachability warnings
+# 90-99:   Common range for cleanup/error handlers
+# 100-999: Common range for parallel task groups and special handlers
+# The two ranges are contiguous, so a single bounds check covers both
+SPECIAL_TASK_ID_MIN = 90
+SPECIAL_TASK_ID_MAX = 999
+
+# Pre-compiled regex patterns for performance optimization
+# These patterns are used for global variable resolution on every validated field
+# Variable names cannot start with a digit, so task result references (@0_stdout@) never match
+_GLOBAL_VAR_PATTERN = re.compile(r'@([a-zA-Z_][a-zA-Z0-9_]*)@')
+# Single-pass scan for both reference kinds: @N_stdout@-style task results or @VARIABLE@ globals
+_AT_REFERENCE_PATTERN = re.compile(
+    r'@(?:(?P<task>\d+)_(?P<kind>stdout|stderr|success|exit)|(?P<var>[a-zA-Z_][a-zA-Z0-9_]*))@',
+    re.IGNORECASE
+)
+# Condition expression checks (run for every next/success/failure/condition/loop_break value)
+_EXIT_CODE_PATTERN = re.compile(r'exit_(\d+)')
+_INVALID_EXIT_EQUALS_PATTERN = re.compile(r'exit=(\d+)')
+# Task result references (@N_stdout@, @N_stderr@, @N_success@, @N_exit@), CASE INSENSITIVE
+# Only the task ID is captured, so findall() returns the IDs directly
+_TASK_REFERENCE_PATTERN = re.compile(r'@(\d+)_(?:stdout|stderr|success|exit)@', re.IGNORECASE)
+# Simple condition syntax accepted by validate_simple_condition_syntax
+# CASE INSENSITIVE: Accept both @0_stdout@ and @0_STDOUT@, stdout~ and STDOUT~, etc.
+_VALID_CONDITION_PATTERN_SOURCES = (
+    r'^exit_\d+$',                           # exit_0, exit_1, etc.
+    r'^exit_not_0$',                         # exit_not_0
+    r'^stdout~',                             # stdout pattern matching
+    r'^stdout!~',                            # stdout pattern not matching
+    r'^stdout(=|!=)',                        # stdout equality/inequality
+    r'^stdout(<|<=|>|>=)',                   # stdout numeric comparison
+    r'^stdout_count[=<>]',                   # stdout_count with operators
+    r'^stderr~',                             # stderr pattern matching
+    r'^stderr!~',                            # stderr pattern not matching
+    r'^stderr(=|!=)',                        # stderr equality/inequality
+    r'^stderr(<|<=|>|>=)',                   # stderr numeric comparison
+    r'^stderr_count[=<>]',                   # stderr_count with operators
+    r'^(true|false)$',                       # boolean literals
+    r'^success$',                            # success keyword
+    r'^[a-zA-Z_]\w*[=!<>~]',                # variable comparisons
+    r'^exit[=!<>]',                          # exit comparisons (current task)
+    r'^@\d+_(stdout|stderr|success|exit)@$',  # standalone task result placeholders
+    r'^@\d+_(stdout|stderr|success|exit)@[=!<>~]',  # task result comparisons
+    r'^contains:',                           # legacy contains
+    r'^not_contains:',                       # legacy not_contains
+)
+# All of the above as one alternation, so a condition is checked in a single match call
+_VALID_CONDITION_PATTERN = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in _VALID_CONDITION_PATTERN_SOURCES),
+    re.IGNORECASE
+)
+# Heuristic for 'a,b' conditions that should have used '|'
+_COMMA_HINT_PATTERN = re.compile(r'^\w+,')
+# Multi-task success conditions for parallel/conditional blocks that need no modifier value
+_SIMPLE_MULTI_TASK_CONDITIONS = frozenset({'all_success', 'any_success', 'majority_success'})
+# Plain integers (routing targets, modifier values); anything else is rejected without int()
+_INTEGER_PATTERN = re.compile(r'[+-]?\d+')
+
 
 class TaskValidator:
+    # Fixed attribute layout: one validator handles a whole file and reads these
+    # attributes in every per-task check. Options set by validate_task_file
+    # (callbacks, skip flags, recovery variables) are listed too.
+    __slots__ = (
+        # Input and results
+        'task_file', 'tasks', 'errors', 'warnings', 'max_errors',
+        'global_vars', 'referenced_global_vars', 'unexpanded_global_vars',
+        # Options
+        'debug', 'sanitizer', 'skip_security_validation', 'skip_subtask_range_validation',
+        'strict_env_validation', 'recovery_saved_global_vars', '_log_callback', '_debug_callback',
+        # Field definitions
+        'required_fields', 'conditional_fields', 'optional_fields',
+        'parallel_conditional_specific_fields', 'known_task_fields', 'valid_next_values',
+        'valid_direct_modifiers', 'valid_task_types', 'known_delimiters', 'valid_operators',
+        '_required_field_set', '_conditional_field_sets', '_all_known_fields',
+        # Per-validation caches and indexes
+        '_global_var_keys', '_resolved_text_cache', '_subtask_ids', '_condition_cache', '_task_index',
+    )
+
+    # Common exec aliases mapped to their standard execution type
+    _EXEC_ALIAS_MAP = {
+        'sh': 'shell',
+        'bash': 'shell',
+        '/bin/sh': 'shell',
+        '/bin/bash': 'shell'
+    }
+
+    # Supported execution types (in the order listed in warnings) and every accepted exec value
+    _VALID_EXEC_TYPES = ('pbrun', 'p7s', 'local', 'wwrs', 'shell')
+    _KNOWN_EXEC_VALUES = frozenset(_VALID_EXEC_TYPES) | frozenset(_EXEC_ALIAS_MAP)
+
+    # Task fields sanitized with exec-type-aware security validation
+    _SECURITY_CHECKED_FIELDS = ('command', 'arguments', 'hostname')
+
+    # Routing fields that conflict with 'next', keyed by (has on_success, has on_failure)
+    _ROUTING_CONFLICT_FIELDS = {
+        (True, False): 'on_success',
+        (False, True): 'on_failure',
+        (True, True): 'on_success, on_failure'
+    }
+
+    # Reserved variables that are substituted during execution (not global variables)
+    _RESERVED_VARIABLES = frozenset({'task'})  # @task@ is replaced with subtask ID during generation
+
+    # Execution fields a decision block must not have (error) or silently ignores (warning),
+    # in reporting order
+    _DECISION_FORBIDDEN_FIELDS = {
+        'command': "should not have a 'command' field.",
+        'hostname': "should not have a 'hostname' field.",
+        'arguments': "should not have an 'arguments' field.",
+        'timeout': "cannot use 'timeout'."
+    }
+    _DECISION_IGNORED_FIELDS = {
+        'exec': "'exec' is ignored.",
+        'stdout_split': "'stdout_split' has no effect and will be ignored.",
+        'stderr_split': "'stderr_split' has no effect and will be ignored.",
+        'stdout_count': "'stdout_count' has no effect and will be ignored.",
+        'stderr_count': "'stderr_count' has no effect and will be ignored."
+    }
+
     def __init__(self):
         """
         Initialize a TaskValidator with default validation state, schemas, and helpers.
@@ -49,6 +169,7 @@ class TaskValidator:
         self.tasks = []
         self.errors = []
         self.warnings = []
+        self.max_errors = MAX_VALIDATION_ERRORS  # Stop per-task validation after this many errors (None = no limit)
 
         # Security hardening: Initialize input sanitizer
         self.sanitizer = InputSanitizer()
@@ -59,8 +180,13 @@ class TaskValidator:
 
         # Global variables support
         self.global_vars = {}  # Store global variables for validation
+        self._global_var_keys = frozenset()  # Frozen global variable names for parse-time lookups
         self.referenced_global_vars = set()  # Track which global variables are used
         self.unexpanded_global_vars = {}  # Track unexpanded env vars for deferred validation
+        self._resolved_text_cache = {}  # Resolved text per raw field value (globals are fixed during validation)
+        self._subtask_ids = {}  # Parsed subtask ID lists per (task line, field) for reuse in reachability analysis
+        self._condition_cache = {}  # Validation results per (condition, field name)
+        self._task_index = None  # Task ID -> task dict, built lazily once parsing is complete
         
         # Define required and optional fields for tasks
         self.required_fields = ['task']
@@ -94,15 +220,27 @@ class TaskValidator:
             *self.parallel_conditional_specific_fields  # Add retry fields
         ]
 
+        # Frozen field sets for per-task presence checks (set difference runs in C)
+        self._required_field_set = frozenset(self.required_fields)
+        self._conditional_field_sets = {
+            task_type: frozenset(fields) for task_type, fields in self.conditional_fields.items()
+        }
+        self._all_known_fields = frozenset(
+            self.required_fields +
+            [field for fields in self.conditional_fields.values() for field in fields] +
+            self.optional_fields + self.parallel_conditional_specific_fields +
+            ['line_start', 'field_lines']
+        )
+
         # Valid values for certain fields - SIMPLIFIED
-        self.valid_next_values = [
+        self.valid_next_values = frozenset([
             'always', 'never', 'loop', 'success',
             # Parallel and Conditional-specific next conditions
             'all_success', 'any_success', 'majority_success'
-        ]
+        ])
         
         # Valid direct modifiers (no partial_success prefix needed)
-        self.valid_direct_modifiers = ['min_success', 'max_failed', 'min_failed', 'max_success']
+        self.valid_direct_modifiers = frozenset(['min_success', 'max_failed', 'min_failed', 'max_success'])
         
         # Valid task types - NEW: Added 'conditional' and 'decision'
         self.valid_task_types = ['parallel', 'conditional', 'decision']
@@ -146,133 +284,133 @@ class TaskValidator:
             errors.append(f"Task file '{task_file}' not found")
             return {'success': False, 'errors': errors, 'global_vars': {}, 'unexpanded_vars': {}}
 
+        # Stream lines from disk: parsing stops at the first task definition,
+        # so the task section of the file is never read
         with open(task_file, 'r') as f:
-            lines = f.readlines()
-
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
 
-            # Skip empty lines and comments
-            if not line or line.startswith('#'):
-                continue
+                # Skip empty lines and comments
+                if not line or line.startswith('#'):
+                    continue
 
-            # Skip file-defined arguments
-            if line.startswith(('-', '--')):
-                continue
+                # Skip file-defined arguments
+                if line.startswith(('-', '--')):
+                    continue
 
-            # Stop at first task definition
-            task_match = re.match(r'^\s*task\s*=\s*(.*)', line)
-            if task_match:
-                break
+                # Stop at first task definition
+                task_match = re.match(r'^\s*task\s*=\s*(.*)', line)
+                if task_match:
+                    break
 
-            # Parse global variable definitions
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key = key.strip()
-                value = value.strip()
+                # Parse global variable definitions
+                key, separator, value = line.partition('=')
+                if separator:
+                    key = key.strip()
+                    value = value.strip()
 
-                # Skip task field names
-                known_task_fields = (
-                    'task', 'hostname', 'command', 'arguments', 'next', 'stdout_split', 'stderr_split',
-                    'stdout_count', 'stderr_count', 'sleep', 'loop', 'loop_break', 'on_failure',
-                    'on_success', 'success', 'failure', 'condition', 'exec', 'timeout', 'return',
-                    'type', 'max_parallel', 'tasks', 'retry_failed', 'retry_count', 'retry_delay',
-                    'if_true_tasks', 'if_false_tasks'
-                )
-                if key in known_task_fields:
-                    continue
+                    # Skip task field names
+                    known_task_fields = (
+                        'task', 'hostname', 'command', 'arguments', 'next', 'stdout_split', 'stderr_split',
+                        'stdout_count', 'stderr_count', 'sleep', 'loop', 'loop_break', 'on_failure',
+                        'on_success', 'success', 'failure', 'condition', 'exec', 'timeout', 'return',
+                        'type', 'max_parallel', 'tasks', 'retry_failed', 'retry_count', 'retry_delay',
+                        'if_true_tasks', 'if_false_tasks'
+                    )
+                    if key in known_task_fields:
+                        continue
 
-                # Store original value for comparison
-                original_value = value
-
-                # Expand environment variables
-                expanded_value = os.path.expandvars(value)
-
-                # Detect referenced env vars that are not set in the current environment
-                if '$' in value:
-                    env_var_matches = re.findall(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)', value)
-                    referenced_vars = [var for match in env_var_matches for var in match if var]
-                    unexpanded_env_vars = [v for v in referenced_vars if v not in os.environ]
-
-                    if unexpanded_env_vars:
-                        # DEFERRED VALIDATION: Track unexpanded variable for later validation
-                        # Only fail if this variable is actually used in tasks
-                        unexpanded_vars[key] = {
-                            'line_num': line_num,
-                            'env_vars': unexpanded_env_vars
-                        }
-                        # Log at DEBUG level during parsing
-                        if debug_callback:
-                            env_vars_str = ', '.join(['$' + v for v in unexpanded_env_vars])
-                            debug_callback(
-                                f"# Global variable '{key}' contains unexpanded environment variable(s): {env_vars_str}. "
-                                f"Will validate if this variable is used in tasks."
-                            )
-                        # Continue processing (don't return early)
-
-                # Strict validation: Check for TASKER_ prefix requirement
-                if strict_env_validation and '$' in value:
-                    # Extract all environment variable references from the value
-                    # Match either ${VAR} or $VAR, but not mismatched combinations like ${VAR or $VAR}
-                    # Using alternation pattern to ensure proper brace pairing
-                    env_var_matches = re.findall(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)', value)
-                    # Flatten the tuple results (one group will be empty for each match)
-                    env_vars_in_value = [var for match in env_var_matches for var in match if var]
-
-                    for env_var in env_vars_in_value:
-                        if not env_var.startswith('TASKER_'):
-                            errors.append(
-                                f"Line {line_num}: Strict environment variable validation failed for global variable '{key}'. "
-                                f"Environment variable '${env_var}' does not start with required prefix 'TASKER_'. "
-                                f"Either use TASKER_-prefixed variables or disable --strict-env-validation flag."
-                            )
-                            # Early return on strict validation failure
-                            return {'success': False, 'errors': errors, 'global_vars': {}, 'unexpanded_vars': {}}
-
-                # Log all global variables at DEBUG level during validation (selective masking for sensitive vars)
-                if debug_callback:
-                    from ..core.condition_evaluator import ConditionEvaluator
-
-                    if expanded_value != original_value:
-                        # Value was expanded - show expansion message
-                        if ConditionEvaluator.should_mask_variable(key):
-                            # Mask sensitive variable values
-                            masked = ConditionEvaluator.mask_value(expanded_value)
-                            debug_callback(f"# Global variable {key}: {masked} (expanded from {original_value})")
+                    # Store original value for comparison
+                    original_value = value
+
+                    # Expand environment variables
+                    expanded_value = os.path.expandvars(value)
+
+                    # Detect referenced env vars that are not set in the current environment
+                    if '$' in value:
+                        env_var_matches = re.findall(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)', value)
+                        referenced_vars = [var for match in env_var_matches for var in match if var]
+                        unexpanded_env_vars = [v for v in referenced_vars if v not in os.environ]
+
+                        if unexpanded_env_vars:
+                            # DEFERRED VALIDATION: Track unexpanded variable for later validation
+                            # Only fail if this variable is actually used in tasks
+                            unexpanded_vars[key] = {
+                                'line_num': line_num,
+                                'env_vars': unexpanded_env_vars
+                            }
+                            # Log at DEBUG level during parsing
+                            if debug_callback:
+                                env_vars_str = ', '.join(['$' + v for v in unexpanded_env_vars])
+                                debug_callback(
+                                    f"# Global variable '{key}' contains unexpanded environment variable(s): {env_vars_str}. "
+                                    f"Will validate if this variable is used in tasks."
+                                )
+                            # Continue processing (don't return early)
+
+                    # Strict validation: Check for TASKER_ prefix requirement
+                    if strict_env_validation and '$' in value:
+                        # Extract all environment variable references from the value
+                        # Match either ${VAR} or $VAR, but not mismatched combinations like ${VAR or $VAR}
+                        # Using alternation pattern to ensure proper brace pairing
+                        env_var_matches = re.findall(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)', value)
+                        # Flatten the tuple results (one group will be empty for each match)
+                        env_vars_in_value = [var for match in env_var_matches for var in match if var]
+
+                        for env_var in env_vars_in_value:
+                            if not env_var.startswith('TASKER_'):
+                                errors.append(
+                                    f"Line {line_num}: Strict environment variable validation failed for global variable '{key}'. "
+                                    f"Environment variable '${env_var}' does not start with required prefix 'TASKER_'. "
+                                    f"Either use TASKER_-prefixed variables or disable --strict-env-validation flag."
+                                )
+                                # Early return on strict validation failure
+                                return {'success': False, 'errors': errors, 'global_vars': {}, 'unexpanded_vars': {}}
+
+                    # Log all global variables at DEBUG level during validation (selective masking for sensitive vars)
+                    if debug_callback:
+                        from ..core.condition_evaluator import ConditionEvaluator
+
+                        if expanded_value != original_value:
+                            # Value was expanded - show expansion message
+                            if ConditionEvaluator.should_mask_variable(key):
+                                # Mask sensitive variable values
+                                masked = ConditionEvaluator.mask_value(expanded_value)
+                                debug_callback(f"# Global variable {key}: {masked} (expanded from {original_value})")
+                            else:
+                                # Show non-sensitive values for operational transparency
+                                debug_callback(f"# Global variable {key}: {expanded_value} (expanded from {original_value})")
+                                debug_callback(f"#   Original: {original_value}")
+                                debug_callback(f"#   Expanded: {expanded_value}")
                         else:
-                            # Show non-sensitive values for operational transparency
-                            debug_callback(f"# Global variable {key}: {expanded_value} (expanded from {original_value})")
-                            debug_callback(f"#   Original: {original_value}")
-                            debug_callback(f"#   Expanded: {expanded_value}")
-                    else:
-                        # Value was not expanded (no env var or env var doesn't exist)
-                        if ConditionEvaluator.should_mask_variable(key):
-                            masked = ConditionEvaluator.mask_value(expanded_value)
-                            debug_callback(f"# Global variable {key}: {masked}")
-                        else:
-                            debug_callback(f"# Global variable {key}: {expanded_value}")
-
-                # CRITICAL SECURITY: Sanitize expanded global variable
-                # This prevents command injection and other security vulnerabilities
-                sanitize_result = sanitizer.sanitize_global_variable(key, expanded_value)
-
-                # Check for sanitization errors
-                if not sanitize_result['valid']:
-                    for error in sanitize_result['errors']:
-                        errors.append(f"Line {line_num}: Global variable security error: {error}")
-                    # Skip this global variable - do not store it
-                    continue
+                            # Value was not expanded (no env var or env var doesn't exist)
+                            if ConditionEvaluator.should_mask_variable(key):
+                                masked = ConditionEvaluator.mask_value(expanded_value)
+                                debug_callback(f"# Global variable {key}: {masked}")
+                            else:
+                                debug_callback(f"# Global variable {key}: {expanded_value}")
+
+                    # CRITICAL SECURITY: Sanitize expanded global variable
+                    # This prevents command injection and other security vulnerabilities
+                    sanitize_result = sanitizer.sanitize_global_variable(key, expanded_value)
+
+                    # Check for sanitization errors
+                    if not sanitize_result['valid']:
+                        for error in sanitize_result['errors']:
+                            errors.append(f"Line {line_num}: Global variable security error: {error}")
+                        # Skip this global variable - do not store it
+                        continue
 
-                # Store sanitized value (not the raw expanded value)
-                global_vars[key] = sanitize_result['value']
+                    # Store sanitized value (not the raw expanded value)
+                    global_vars[key] = sanitize_result['value']
 
-                # Capture metadata: track if this variable came from environment or is literal
-                if original_value != expanded_value:
-                    # Variable was expanded from environment variable
-                    metadata[key] = {'source': 'env', 'template': original_value}
-                else:
-                    # Variable is a literal value
-                    metadata[key] = {'source': 'literal'}
+                    # Capture metadata: track if this variable came from environment or is literal
+                    if original_value != expanded_value:
+                        # Variable was expanded from environment variable
+                        metadata[key] = {'source': 'env', 'template': original_value}
+                    else:
+                        # Variable is a literal value
+                        metadata[key] = {'source': 'literal'}
 
         # Return success=False if any errors were accumulated during parsing
         return {
@@ -327,11 +465,20 @@ class TaskValidator:
             'tasks': len(validator.tasks)
         }
 
-    def debug_log(self, message):
-        """ Log a debug message if debug mode is enabled"""
-        if self.debug and hasattr(self, '_debug_callback') and self._debug_callback:
+    def debug_log(self, message, *args):
+        """
+        Log a debug message if debug mode is enabled.
+
+        Optional %-style args are only interpolated when the message is emitted,
+        so hot parse/validation loops don't build strings with debug disabled.
+        """
+        if not self.debug:
+            return
+        if args:
+            message = message % args
+        if hasattr(self, '_debug_callback') and self._debug_callback:
             self._debug_callback(f"TaskValidator: {message}")
-        elif self.debug:
+        else:
             print(f"# DEBUG: TaskValidator: {message}")
 
     def check_for_inline_comments(self, key, value, line_number):
@@ -355,38 +502,44 @@ class TaskValidator:
         """Resolve global variables in text for validation purposes only."""
         if not text or '@' not in text:
             return text
-            
+
+        # Global variables do not change during validation, so identical
+        # field values (e.g. shared retry_count templates) resolve only once
+        cached = self._resolved_text_cache.get(text)
+        if cached is not None:
+            return cached
+
         # Only resolve global variables, not task result variables
-        global_var_pattern = r'@([a-zA-Z_][a-zA-Z0-9_]*)@'
-        
         def replace_var(match):
             var_name = match.group(1)
-            # Skip task result variables (e.g., @0_stdout@, @0_exit@)
-            # CASE INSENSITIVE: Accept @0_STDOUT@, @0_stdout@, etc.
-            task_var_pattern = r'\d+_(stdout|stderr|success|exit)$'
-            if re.match(task_var_pattern, var_name, re.IGNORECASE):
-                return match.group(0)  # Return unchanged
             # Replace with global variable value if defined
             if var_name in self.global_vars:
                 return self.global_vars[var_name]
             else:
                 return match.group(0)  # Return unchanged if not defined
-        
+
         # Replace global variables
-        resolved = re.sub(global_var_pattern, replace_var, text)
+        resolved = _GLOBAL_VAR_PATTERN.sub(replace_var, text)
 
         # Handle nested variables (variable chaining) - max iterations to prevent infinite loops
         for _ in range(MAX_VARIABLE_EXPANSION_DEPTH):
-            new_resolved = re.sub(global_var_pattern, replace_var, resolved)
+            new_resolved = _GLOBAL_VAR_PATTERN.sub(replace_var, resolved)
             if new_resolved == resolved:
                 break  # No more changes
             if '@' not in new_resolved:
                 resolved = new_resolved
                 break  # No more variables to expand - early exit optimization
             resolved = new_resolved
-            
+
+        self._resolved_text_cache[text] = resolved
         return resolved
 
+    def _parse_integer(self, value):
+        """Parse a plain integer field value (routing target, modifier value), or return None if it is not one."""
+        if isinstance(value, str) and _INTEGER_PATTERN.fullmatch(value):
+            return int(value)
+        return None
+
     def clean_field_value(self, value):
         """Clean field value by removing extra whitespace only."""
         if not isinstance(value, str):
@@ -424,6 +577,37 @@ class TaskValidator:
             # Handle any unexpected errors gracefully
             return None
 
+    def _error_limit_reached(self):
+        """
+        Return True once max_errors errors are recorded, after capping self.errors.
+
+        A single task can add several errors and push the count past the limit, so
+        the list is truncated to exactly max_errors before the stop message is added.
+        """
+        max_errors = self.max_errors
+        if max_errors is None or len(self.errors) < max_errors:
+            return False
+        del self.errors[max_errors:]
+        self.errors.append(f"Validation stopped after {max_errors} errors. Fix the reported errors and validate again.")
+        return True
+
+    def _find_task_by_id(self, task_id):
+        """
+        Return the first parsed task dict with the given integer ID, or None.
+
+        Subtask checks look up every referenced task several times. Instead of
+        scanning self.tasks for each lookup, a single ID -> task index is built on
+        first use (tasks don't change after parsing) and kept for later lookups.
+        """
+        if self._task_index is None:
+            self._task_index = {}
+            for task_entry in self.tasks:
+                sid = self._safe_task_id_from_entry(task_entry)
+                if sid is not None:
+                    # Keep the first definition, matching the previous linear search
+                    self._task_index.setdefault(sid, task_entry[0])
+        return self._task_index.get(task_id)
+
     def _check_nested_conditional_or_parallel(self, referenced_task_ids, line_number, task_id, parent_type):
         """
         Check if any referenced tasks are conditional or parallel tasks (NOT SUPPORTED).
@@ -443,8 +627,8 @@ class TaskValidator:
         """
         for ref_id in referenced_task_ids:
             # Find the referenced task in our parsed tasks (tasks stored as tuples: (task_dict, line_num))
-            # Use safe lookup to handle malformed task IDs gracefully
-            ref_task = next((t[0] for t in self.tasks if self._safe_task_id_from_entry(t) == ref_id), None)
+            # Index lookup handles malformed task IDs gracefully
+            ref_task = self._find_task_by_id(ref_id)
             if ref_task and 'type' in ref_task:
                 ref_type = ref_task.get('type')
                 if ref_type in ['conditional', 'parallel']:
@@ -473,7 +657,7 @@ class TaskValidator:
         """
         for ref_id in referenced_task_ids:
             # Find the referenced task in our parsed tasks
-            ref_task = next((t[0] for t in self.tasks if self._safe_task_id_from_entry(t) == ref_id), None)
+            ref_task = self._find_task_by_id(ref_id)
             if ref_task:
                 # Check for any loop-related parameters
                 # Note: next=loop is handled by _check_routing_in_subtasks to avoid duplicate errors
@@ -516,7 +700,7 @@ class TaskValidator:
         """
         for ref_id in referenced_task_ids:
             # Find the referenced task in our parsed tasks
-            ref_task = next((t[0] for t in self.tasks if self._safe_task_id_from_entry(t) == ref_id), None)
+            ref_task = self._find_task_by_id(ref_id)
             if ref_task:
                 # Check for routing parameters
                 has_on_success = 'on_success' in ref_task
@@ -619,12 +803,18 @@ class TaskValidator:
             self.errors.append(f"Task file '{self.task_file}' not found.")
             return False
         try:
+            self._parse_global_variables()
+            # Stream task lines straight from disk instead of buffering the whole file
             with open(self.task_file, 'r') as f:
-                lines = f.readlines()
-        except Exception as e:
+                self._parse_task_lines(f)
+        except (OSError, UnicodeDecodeError) as e:
             self.errors.append(f"Error reading task file: {type(e).__name__}: {e}")
             return False
 
+        return len(self.errors) == 0
+
+    def _parse_global_variables(self):
+        """Parse global variables from the task file header into self.global_vars."""
         # PHASE 1: Parse global variables (first pass)
         # Delegate to centralized parse_global_vars_only() to avoid code duplication
         self.debug_log("Parsing global variables...")
@@ -643,18 +833,22 @@ class TaskValidator:
 
         # Use the sanitized and validated global variables
         self.global_vars = parse_result['global_vars']
+        self._global_var_keys = frozenset(self.global_vars)
+        self._resolved_text_cache.clear()
+        self._condition_cache.clear()  # Undefined-variable errors depend on the globals
 
         # Store unexpanded variable tracking for deferred validation
         self.unexpanded_global_vars = parse_result.get('unexpanded_vars', {})
 
-        self.debug_log(f"Parsed {len(self.global_vars)} global variables")
+        self.debug_log("Parsed %d global variables", len(self.global_vars))
 
+    def _parse_task_lines(self, lines):
+        """Parse task definitions from an iterable of raw lines into self.tasks."""
         # PHASE 2: Parse tasks (existing logic with minor updates)
         current_task = None
         line_number = 0
-        
-        for line in lines:
-            line_number += 1
+
+        for line_number, line in enumerate(lines, 1):
             line = line.strip()
 
             # Skip empty lines and comments
@@ -666,65 +860,70 @@ class TaskValidator:
             if line.startswith(('-', '--')):
                 continue
 
-            # Parse key=value pairs
-            if '=' in line:
-                try:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Check if this is a new task definition
-                    if key == 'task':
-                        # Save the previous task if it exists
-                        if current_task is not None:
-                            self.tasks.append((current_task, current_task.get('line_start', line_number)))
+            # Parse key=value pairs (partition locates and splits on '=' in a single scan)
+            key, separator, value = line.partition('=')
+            if not separator:
+                self.warnings.append(f"Line {line_number}: Line does not contain a key=value pair: '{line}'")
+                continue
 
-                        # SECURITY HARDENING: Sanitize task ID field
+            try:
+                # Interned keys match the field-name literals used throughout validation
+                # by identity, so the many "'field' in task" lookups skip string compares
+                key = sys.intern(key.strip())
+                value = value.strip()
+                
+                # Check if this is a new task definition
+                if key == 'task':
+                    # Save the previous task if it exists
+                    if current_task is not None:
+                        self.tasks.append((current_task, current_task.get('line_start', line_number)))
+
+                    # SECURITY HARDENING: Sanitize task ID field (skipped with skip_security_validation)
+                    task_value = value
+                    if not self.skip_security_validation:
                         sanitize_result = self.sanitizer.sanitize_field('task', value)
 
                         # Add any sanitization errors/warnings for task ID
                         for error in sanitize_result['errors']:
                             self.errors.append(f"Line {line_number}: Task ID security error")
-                            self.debug_log(f"Security validation failed: {error}")
+                            self.debug_log("Security validation failed: %s", error)
                         for warning in sanitize_result['warnings']:
                             self.warnings.append(f"Line {line_number}: Task ID security warning")
-                            self.debug_log(f"Security warning: {warning}")
+                            self.debug_log("Security warning: %s", warning)
+
+                        # Use sanitized value when valid, otherwise keep the original
+                        if sanitize_result['valid']:
+                            task_value = sanitize_result['value']
+
+                    # Start a new task
+                    current_task = {'task': task_value, 'line_start': line_number}
+                else:
+                    # Add to current task (only if it's a known task field)
+                    if current_task is not None:
+                        # Check for inline comments in task fields
+                        if self.check_for_inline_comments(key, value, line_number):
+                            continue  # Skip this field if it has inline comments
 
-                        # Start a new task with sanitized or original value
-                        task_value = sanitize_result['value'] if sanitize_result['valid'] else value
-                        current_task = {'task': task_value, 'line_start': line_number}
+                        # Store field first, security validation happens later
+                        # This allows exec=shell to be checked before validating command/arguments
+                        current_task[key] = value
+
+                        # Store line number for later security validation
+                        # Every stored field gets an entry, so lookups need no fallback
+                        current_task.setdefault('field_lines', {})[key] = line_number
+
+                        self.debug_log("%s = %s", key, value)
                     else:
-                        # Add to current task (only if it's a known task field)
-                        if current_task is not None:
-                            # Check for inline comments in task fields
-                            if self.check_for_inline_comments(key, value, line_number):
-                                continue  # Skip this field if it has inline comments
-
-                            # Store field first, security validation happens later
-                            # This allows exec=shell to be checked before validating command/arguments
-                            current_task[key] = value
-
-                            # Store line number for later security validation
-                            if 'field_lines' not in current_task:
-                                current_task['field_lines'] = {}
-                            current_task['field_lines'][key] = line_number
-
-                            self.debug_log(f"{key} = {value}")
-                        else:
-                            # Only warn if it's not a global variable
-                            if key not in self.global_vars:
-                                self.warnings.append(f"Line {line_number}: Key '{key}' found outside of a task definition.")
-                except Exception as e:
-                    self.errors.append(f"Line {line_number}: Error parsing line: {str(e)}")
-            else:
-                self.warnings.append(f"Line {line_number}: Line does not contain a key=value pair: '{line}'")
-        
+                        # Only warn if it's not a global variable
+                        if key not in self._global_var_keys:
+                            self.warnings.append(f"Line {line_number}: Key '{key}' found outside of a task definition.")
+            except Exception as e:
+                self.errors.append(f"Line {line_number}: Error parsing line: {str(e)}")
+
         # Add the last task if it exists
         if current_task is not None:
             self.tasks.append((current_task, current_task.get('line_start', line_number)))
 
-        return len(self.errors) == 0
-
     def validate_tasks(self):
         """
         Validate all parsed tasks for correctness, references, and structure.
@@ -743,29 +942,45 @@ class TaskValidator:
         parallel_tasks = set()  # Track tasks referenced by parallel tasks
         conditional_tasks = set()  # NEW: Track tasks referenced by conditional tasks
 
+        # Bind frequently used methods once instead of resolving attributes per task
+        errors_append = self.errors.append
+        warnings_append = self.warnings.append
+        debug_log = self.debug_log
+        sanitize_field = self.sanitizer.sanitize_field
+        validate_task_structure = self.sanitizer.validate_task_structure
+        validate_retry_field_usage = self.validate_retry_field_usage
+        validate_field_values = self.validate_field_values
+        validate_global_variable_references = self.validate_global_variable_references
+        collect_routing_targets = self._collect_routing_targets
+        error_limit_reached = self._error_limit_reached
+
         for task, line_number in self.tasks:
+            # Fail fast on badly broken files; cross-task checks (gaps, reachability,
+            # unused variables) would only add noise from the unvalidated remainder
+            if error_limit_reached():
+                return False
 
             # Ensure task has a task ID
             if 'task' not in task:
-                self.errors.append(f"Line {line_number}: Missing required field 'task'.")
+                errors_append(f"Line {line_number}: Missing required field 'task'.")
 
             # Check that task ID is an integer
             task_id = task.get('task')
             try:
                 task_id = int(task_id)
                 if task_id < 0:
-                    self.errors.append(f"Line {line_number}: Task ID {task_id} cannot be negative.")
+                    errors_append(f"Line {line_number}: Task ID {task_id} cannot be negative.")
                 elif task_id >= RESERVED_SUBTASK_ID_START:
-                    self.errors.append(
+                    errors_append(
                         f"Line {line_number}: Task ID {task_id} is in reserved range ({RESERVED_SUBTASK_ID_START}+). "
                         f"This range is reserved for auto-generated subtasks from hostnames= parameter. "
                         f"Please use task IDs below {RESERVED_SUBTASK_ID_START}."
                     )
                 elif task_id >= 1000:
-                    self.warnings.append(f"Line {line_number}: Task ID {task_id} is high (>= 1000). Consider using lower IDs for better readability.")
+                    warnings_append(f"Line {line_number}: Task ID {task_id} is high (>= 1000). Consider using lower IDs for better readability.")
                 task_ids.add(task_id)
             except ValueError:
-                self.errors.append(f"Line {line_number}: Task ID '{task_id}' is not an integer.")
+                errors_append(f"Line {line_number}: Task ID '{task_id}' is not an integer.")
 
             # Determine task type (normal, return, parallel, or conditional)
             task_type = 'normal'
@@ -782,65 +997,64 @@ class TaskValidator:
             # Context-aware validation: exec_type determines validation strictness
             if not self.skip_security_validation:
                 # Resolve exec placeholders before sanitizing commands
+                # Fast path: literal exec values (no @VAR@ placeholder) need no resolution
                 raw_exec = task.get('exec', 'local')
-                resolved_exec = self.resolve_global_variables_for_validation(raw_exec) if raw_exec else ''
+                if '@' in raw_exec:
+                    resolved_exec = self.resolve_global_variables_for_validation(raw_exec)
+                else:
+                    resolved_exec = raw_exec
                 exec_type = (self.clean_field_value(resolved_exec) or 'local').lower()
 
                 # Map common aliases to standard values
-                alias_map = {
-                    'sh': 'shell',
-                    'bash': 'shell',
-                    '/bin/sh': 'shell',
-                    '/bin/bash': 'shell'
-                }
-                exec_type = alias_map.get(exec_type, exec_type)
+                exec_type = self._EXEC_ALIAS_MAP.get(exec_type, exec_type)
 
                 field_lines = task.get('field_lines', {})
 
-                for field_name in ['command', 'arguments', 'hostname']:
+                for field_name in self._SECURITY_CHECKED_FIELDS:
                     if field_name in task:
                         field_value = task[field_name]
-                        field_line = field_lines.get(field_name, line_number)
+                        field_line = field_lines[field_name]
 
                         # Context-aware security validation
                         # - exec=shell: Allow shell syntax, warn about dangerous patterns
                         # - exec=local: Strict validation (block shell metacharacters)
-                        sanitize_result = self.sanitizer.sanitize_field(field_name, field_value, exec_type=exec_type)
+                        sanitize_result = sanitize_field(field_name, field_value, exec_type=exec_type)
 
                         # Add any sanitization errors/warnings
                         for error in sanitize_result['errors']:
-                            self.errors.append(f"Line {field_line}: Task field security error")
-                            self.debug_log(f"Security validation failed: {error}")
+                            errors_append(f"Line {field_line}: Task field security error")
+                            debug_log("Security validation failed: %s", error)
                         for warning in sanitize_result['warnings']:
-                            self.warnings.append(f"Line {field_line}: Task field security warning")
-                            self.debug_log(f"Security warning: {warning}")
+                            warnings_append(f"Line {field_line}: Task field security warning")
+                            debug_log("Security warning: %s", warning)
 
             # Check for required fields based on task type
-            for field in self.required_fields:
-                if field not in task:
-                    self.errors.append(f"Line {line_number}: Task {task_id} is missing required field '{field}'.")
+            # Set difference finds missing fields; the ordered list keeps messages deterministic
+            missing_fields = self._required_field_set.difference(task)
+            if missing_fields:
+                for field in self.required_fields:
+                    if field in missing_fields:
+                        errors_append(f"Line {line_number}: Task {task_id} is missing required field '{field}'.")
 
             # Check for conditional required fields based on task type
-            for field in self.conditional_fields[task_type]:
-                if field not in task:
-                    self.errors.append(f"Line {line_number}: Task {task_id} ({task_type} type) is missing required field '{field}'.")
+            missing_fields = self._conditional_field_sets[task_type].difference(task)
+            if missing_fields:
+                for field in self.conditional_fields[task_type]:
+                    if field in missing_fields:
+                        errors_append(f"Line {line_number}: Task {task_id} ({task_type} type) is missing required field '{field}'.")
 
             # Check for unknown fields
-            all_known_fields = set(self.required_fields + self.conditional_fields['normal'] +
-                                  self.conditional_fields['return'] + self.conditional_fields['parallel'] +
-                                  self.conditional_fields['conditional'] +  # NEW: Add conditional fields
-                                  self.conditional_fields['decision'] +  # Add decision fields
-                                  self.optional_fields + self.parallel_conditional_specific_fields +
-                                  ['line_start', 'field_lines'])
-            for field in task:
-                if field not in all_known_fields:
-                    self.warnings.append(f"Line {line_number}: Task {task_id} has unknown field '{field}'.")
+            unknown_fields = task.keys() - self._all_known_fields
+            if unknown_fields:
+                for field in task:
+                    if field in unknown_fields:
+                        warnings_append(f"Line {line_number}: Task {task_id} has unknown field '{field}'.")
 
             # Check for retry fields in non-parallel/non-conditional tasks
-            self.validate_retry_field_usage(task, task_id, task_type, line_number)
+            validate_retry_field_usage(task, task_id, task_type, line_number)
 
             # Validate specific field values
-            self.validate_field_values(task, task_id, line_number)
+            validate_field_values(task, task_id, line_number)
 
             # Validate parallel task specific fields
             if task_type == 'parallel':
@@ -858,45 +1072,41 @@ class TaskValidator:
             if task_type == 'decision':
                 self.validate_decision_task(task, task_id, line_number)
 
-            # Validate global variable references
-            self.validate_global_variable_references(task, task_id, line_number)
-
-            # Collect referenced tasks
-            self.collect_referenced_tasks(task, referenced_tasks)
+            # Validate global variable references and collect referenced tasks in the same field loop
+            validate_global_variable_references(task, task_id, line_number, referenced_tasks)
+            collect_routing_targets(task, referenced_tasks)
 
             # SECURITY HARDENING: Validate overall task structure for security issues
-            structure_result = self.sanitizer.validate_task_structure(task)
+            structure_result = validate_task_structure(task)
             for error in structure_result['errors']:
-                self.errors.append(f"Line {line_number}: Task {task_id} structure error - {error}")
+                errors_append(f"Line {line_number}: Task {task_id} structure error - {error}")
             for warning in structure_result['warnings']:
-                self.warnings.append(f"Line {line_number}: Task {task_id} structure warning - {warning}")
+                warnings_append(f"Line {line_number}: Task {task_id} structure warning - {warning}")
+
+        # The last task can also reach the limit; stop before the cross-task checks
+        if error_limit_reached():
+            return False
 
         # Check for duplicate task IDs (robust detection with normalized IDs)
-        id_counts = {}
-        for t in self.tasks:
-            sid = self._safe_task_id_from_entry(t)
-            if sid is not None:
-                id_counts[sid] = id_counts.get(sid, 0) + 1
+        safe_ids = (self._safe_task_id_from_entry(t) for t in self.tasks)
+        id_counts = Counter(sid for sid in safe_ids if sid is not None)
         for id_val, count in id_counts.items():
             if count > 1:
                 self.errors.append(f"Task ID {id_val} is defined multiple times.")
 
+        # All tasks reachable through explicit references (on_success, on_failure,
+        # parallel tasks, conditional branch tasks) - shared by the gap and reachability checks
+        explicitly_referenced = referenced_tasks | parallel_tasks | conditional_tasks
+
         # Smart gap validation with hybrid approach
-        sorted_task_ids = sorted(task_ids)
-        if sorted_task_ids:
-            # Build set of all explicitly reachable tasks
-            # (via on_success, on_failure, parallel tasks, conditional branch tasks)
-            explicitly_reachable = set()
-            explicitly_reachable.update(referenced_tasks)
-            explicitly_reachable.update(parallel_tasks)
-            explicitly_reachable.update(conditional_tasks)
-
-            # Define special task ranges (e.g., cleanup handlers, parallel groups)
-            # These are commonly used patterns that shouldn't trigger gap warnings
-            special_ranges = [
-                (90, 99),    # Common range for cleanup/error handlers
-                (100, 999),  # Common range for parallel task groups and special handlers
-            ]
+        # O(N) pre-check: a gap exists only if some ID other than the lowest lacks its
+        # predecessor. Contiguous workflows (the common case) skip the sort entirely.
+        has_gaps = False
+        if task_ids:
+            lowest_id = min(task_ids)
+            has_gaps = any(tid - 1 not in task_ids for tid in task_ids if tid != lowest_id)
+        if has_gaps:
+            sorted_task_ids = sorted(task_ids)
 
             # Check for gaps in the sequence
             for i in range(len(sorted_task_ids) - 1):
@@ -906,7 +1116,7 @@ class TaskValidator:
                 # If there's a gap between consecutive tasks
                 if next_id - current_id > 1:
                     # Check if the next task after the gap is explicitly reachable
-                    gap_is_reachable = next_id in explicitly_reachable
+                    gap_is_reachable = next_id in explicitly_referenced
 
                     # Check if current task has explicit routing (breaks sequential flow intentionally)
                     current_task = None
@@ -924,8 +1134,8 @@ class TaskValidator:
                             'return' in current_task
                         )
 
-                    # Check if next task is in a special range
-                    in_special_range = any(start <= next_id <= end for start, end in special_ranges)
+                    # Check if next task is in the special range (cleanup handlers, parallel groups)
+                    in_special_range = SPECIAL_TASK_ID_MIN <= next_id <= SPECIAL_TASK_ID_MAX
 
                     # Only flag gap if:
                     # 1. Next task is NOT explicitly reachable, AND
@@ -957,7 +1167,7 @@ class TaskValidator:
             self.errors.append(f"Task {ref} is referenced by conditional task but not defined.")
 
         # Perform reachability analysis to find orphaned tasks
-        self.check_task_reachability(task_ids, referenced_tasks, parallel_tasks, conditional_tasks)
+        self.check_task_reachability(task_ids, explicitly_referenced)
 
         # Check for unexpanded environment variables in USED global variables (deferred validation)
         # This must run BEFORE check_unused_global_variables() so that used unexpanded vars
@@ -997,8 +1207,10 @@ class TaskValidator:
             # Validate retry_count field
             if has_retry_count:
                 try:
-                    retry_count_resolved = self.resolve_global_variables_for_validation(task['retry_count'])
-                    retry_count = int(retry_count_resolved)
+                    retry_count_raw = task['retry_count']
+                    if '@' in retry_count_raw:
+                        retry_count_raw = self.resolve_global_variables_for_validation(retry_count_raw)
+                    retry_count = int(retry_count_raw)
                     if retry_count < 1:
                         self.errors.append(f"Line {line_number}: Task {task_id} has invalid retry_count: {retry_count}. Must be between 1 and 1000.")
                     elif retry_count > 1000:
@@ -1011,8 +1223,10 @@ class TaskValidator:
             # Validate retry_delay field
             if has_retry_delay:
                 try:
-                    retry_delay_resolved = self.resolve_global_variables_for_validation(task['retry_delay'])
-                    retry_delay = int(retry_delay_resolved)
+                    retry_delay_raw = task['retry_delay']
+                    if '@' in retry_delay_raw:
+                        retry_delay_raw = self.resolve_global_variables_for_validation(retry_delay_raw)
+                    retry_delay = int(retry_delay_raw)
                     if retry_delay < 0:
                         self.errors.append(f"Line {line_number}: Task {task_id} has negative retry_delay: {retry_delay}")
                     elif retry_delay > 300:
@@ -1081,10 +1295,11 @@ class TaskValidator:
                     for task_ref in tasks_str.split(','):
                         task_ref = task_ref.strip()
                         if task_ref:
-                            ref_id = int(task_ref)
-                            referenced_task_ids.append(ref_id)
-                            parallel_tasks.add(ref_id)
-                    
+                            referenced_task_ids.append(int(task_ref))
+
+                    # Share the parsed list with reachability analysis (avoids re-splitting)
+                    self._subtask_ids[(line_number, 'tasks')] = referenced_task_ids
+
                     if len(referenced_task_ids) == 0:
                         self.errors.append(f"Line {line_number}: Task {task_id} has no valid task references in tasks field.")
                     
@@ -1112,6 +1327,9 @@ class TaskValidator:
 
                 except ValueError as e:
                     self.errors.append(f"Line {line_number}: Task {task_id} has invalid task reference in tasks field: {str(e)}")
+                finally:
+                    # Bulk-record references (including those parsed before an invalid entry)
+                    parallel_tasks.update(referenced_task_ids)
 
         # CRITICAL: Validate tasks= XOR hostnames= (mutually exclusive)
         has_tasks = 'tasks' in task
@@ -1292,9 +1510,10 @@ class TaskValidator:
             for task_ref in tasks_str.split(','):
                 task_ref = task_ref.strip()
                 if task_ref:
-                    ref_id = int(task_ref)
-                    referenced_task_ids.append(ref_id)
-                    conditional_tasks.add(ref_id)
+                    referenced_task_ids.append(int(task_ref))
+
+            # Share the parsed list with reachability analysis (avoids re-splitting)
+            self._subtask_ids[(line_number, field_name)] = referenced_task_ids
 
             if len(referenced_task_ids) == 0:
                 self.errors.append(f"Line {line_number}: Task {task_id} has no valid task references in {field_name} field.")
@@ -1317,6 +1536,9 @@ class TaskValidator:
 
         except ValueError as e:
             self.errors.append(f"Line {line_number}: Task {task_id} has invalid task reference in {field_name} field: {str(e)}")
+        finally:
+            # Bulk-record references (including those parsed before an invalid entry)
+            conditional_tasks.update(referenced_task_ids)
 
     def validate_decision_task(self, task, task_id, line_number):
         """Validate decision block specific fields."""
@@ -1349,28 +1571,19 @@ class TaskValidator:
         if has_failure:
             self.validate_condition_expression(task['failure'], 'failure', task_id, line_number)
 
-        # Decision blocks should NOT have command or hostname
-        if 'command' in task:
-            self.errors.append(f"Line {line_number}: Task {task_id} is a decision block and should not have a 'command' field.")
-
-        if 'hostname' in task:
-            self.errors.append(f"Line {line_number}: Task {task_id} is a decision block and should not have a 'hostname' field.")
+        # Decision blocks should NOT have command, hostname, arguments or timeout (no execution occurs)
+        forbidden_fields = self._DECISION_FORBIDDEN_FIELDS.keys() & task.keys()
+        if forbidden_fields:
+            for field, message in self._DECISION_FORBIDDEN_FIELDS.items():
+                if field in forbidden_fields:
+                    self.errors.append(f"Line {line_number}: Task {task_id} is a decision block and {message}")
 
-        if 'arguments' in task:
-            self.errors.append(f"Line {line_number}: Task {task_id} is a decision block and should not have an 'arguments' field.")
-
-        # Decision blocks must not specify timeout (no execution occurs)
-        if 'timeout' in task:
-            self.errors.append(f"Line {line_number}: Task {task_id} is a decision block and cannot use 'timeout'.")
-
-        # Exec type is irrelevant for decision blocks; warn to avoid confusion
-        if 'exec' in task:
-            self.warnings.append(f"Line {line_number}: Task {task_id} is a decision block; 'exec' is ignored.")
-
-        # Output splitting/counting fields are meaningless on decision blocks; warn
-        for field in ['stdout_split', 'stderr_split', 'stdout_count', 'stderr_count']:
-            if field in task:
-                self.warnings.append(f"Line {line_number}: Task {task_id} is a decision block; '{field}' has no effect and will be ignored.")
+        # Exec type and output splitting/counting fields are meaningless on decision blocks; warn
+        ignored_fields = self._DECISION_IGNORED_FIELDS.keys() & task.keys()
+        if ignored_fields:
+            for field, message in self._DECISION_IGNORED_FIELDS.items():
+                if field in ignored_fields:
+                    self.warnings.append(f"Line {line_number}: Task {task_id} is a decision block; {message}")
 
         # Flow control validation is handled by validate_field_values
         # Just check that at least one flow control field is present
@@ -1378,115 +1591,100 @@ class TaskValidator:
         if not has_flow_control:
             self.warnings.append(f"Line {line_number}: Task {task_id} is a decision block without explicit flow control (on_success, on_failure, or next). Will continue to next sequential task.")
 
-    def validate_global_variable_references(self, task, task_id, line_number):
-        """Validate that all global variable references (@VARIABLE@) are defined and track usage."""
+    def validate_global_variable_references(self, task, task_id, line_number, referenced_tasks=None):
+        """
+        Validate that all global variable references (@VARIABLE@) are defined and track usage.
 
-        # Pattern to match @VARIABLE@ but exclude @X_stdout@, @X_stderr@, @X_success@
-        # CASE INSENSITIVE: Accept @0_STDOUT@, @0_stdout@, etc.
-        global_var_pattern = r'@([a-zA-Z_][a-zA-Z0-9_]*)@'
-        task_result_pattern = r'@(\d+)_(stdout|stderr|success|exit)@'
+        If referenced_tasks is given, the IDs of task result references (@N_stdout@ etc.)
+        in the task's string fields are added to it.
+        """
 
-        # Reserved variables that are substituted during execution (not global variables)
-        reserved_variables = {'task'}  # @task@ is replaced with subtask ID during generation
+        global_vars = self.global_vars
+        mark_referenced = self.referenced_global_vars.add
 
-        # Check all string fields in the task
+        # Check all string fields in the task (timeout, loop, sleep, retry_count etc. may be templated too)
+        # Every reference needs an opening and closing '@', so fields with fewer than
+        # two (plain values, e-mail addresses) never reach the regex engine
         for field_name, field_value in task.items():
-            if isinstance(field_value, str) and '@' in field_value:
-
-                # Find all potential global variable references
-                # Note: global_var_pattern already excludes @X_output@ patterns since it requires
-                # the variable name to start with a letter or underscore, not a digit
-                global_matches = re.findall(global_var_pattern, field_value)
+            if isinstance(field_value, str) and field_value.count('@') >= 2:
+                # Task IDs get their own scan: the combined pattern below consumes each '@',
+                # so in glued tokens like '@a@0_stdout@' it finds only @a@ and would miss task 0
+                if referenced_tasks is not None:
+                    referenced_tasks.update(map(int, _TASK_REFERENCE_PATTERN.findall(field_value)))
+
+                # Global variable references
+                # (_AT_REFERENCE_PATTERN is CASE INSENSITIVE: Accept @0_STDOUT@, @0_stdout@, etc.)
+                for match in _AT_REFERENCE_PATTERN.finditer(field_value):
+                    var_name = match.group('var')
+                    if var_name is None:
+                        # Task result reference (@N_stdout@ etc.) - collected into referenced_tasks above
+                        continue
 
-                for var_name in global_matches:
                     # Skip reserved variables
-                    if var_name.lower() in reserved_variables:
+                    if var_name.lower() in self._RESERVED_VARIABLES:
                         continue
 
                     # Track usage of this global variable
-                    self.referenced_global_vars.add(var_name)
+                    mark_referenced(var_name)
 
                     # Check if the global variable is defined
-                    if var_name not in self.global_vars:
+                    if var_name not in global_vars:
                         self.errors.append(
                             f"Line {line_number}: Task {task_id} field '{field_name}' references "
                             f"undefined global variable '@{var_name}@'. "
                             f"Define it as: {var_name}=value"
                         )
-                        
-                # Also validate that task result references are properly formatted
-                task_result_matches = re.findall(task_result_pattern, field_value, re.IGNORECASE)
-                for task_num, output_type in task_result_matches:
-                    try:
-                        ref_task = int(task_num)
-                        # This will be validated later in collect_referenced_tasks
-                    except ValueError:
-                        self.errors.append(
-                            f"Line {line_number}: Task {task_id} field '{field_name}' has "
-                            f"invalid task reference '@{task_num}_{output_type}@'"
-                        )
 
-    def check_task_reachability(self, task_ids, referenced_tasks, parallel_tasks, conditional_tasks):
-        """Check for unreachable/orphaned tasks using graph traversal."""
+    def check_task_reachability(self, task_ids, explicitly_referenced):
+        """
+        Check for unreachable/orphaned tasks using graph traversal.
+
+        explicitly_referenced is the union of all task IDs referenced via on_success,
+        on_failure, parallel tasks and conditional branch tasks.
+        """
         if not task_ids:
             return
 
         # Build task graph (who can reach whom)
         task_graph = {}
-        for task, _ in self.tasks:
+        for task, line_number in self.tasks:
             try:
                 task_id = int(task.get('task'))
-                task_graph[task_id] = set()
+                edges = task_graph[task_id] = set()
+
+                # Read routing fields once per task
+                task_type = task.get('type')
+                on_success = task.get('on_success')
+                on_failure = task.get('on_failure')
 
                 # Add sequential progression (task_id -> task_id + 1)
                 # unless task has explicit routing or is special type
                 if (task_id + 1 in task_ids and
-                    'on_success' not in task and
-                    'on_failure' not in task and
+                    on_success is None and
+                    on_failure is None and
                     'return' not in task and
-                    task.get('type') not in ['parallel', 'conditional']):
-                    task_graph[task_id].add(task_id + 1)
+                    task_type not in ('parallel', 'conditional')):
+                    edges.add(task_id + 1)
 
                 # Add on_success/on_failure jumps
-                if 'on_success' in task:
-                    try:
-                        target = int(task['on_success'])
-                        if target in task_ids:
-                            task_graph[task_id].add(target)
-                    except ValueError:
-                        pass
-
-                if 'on_failure' in task:
-                    try:
-                        target = int(task['on_failure'])
-                        if target in task_ids:
-                            task_graph[task_id].add(target)
-                    except ValueError:
-                        pass
-
-                # Add parallel task references
-                if task.get('type') == 'parallel' and 'tasks' in task:
-                    tasks_str = task['tasks']
-                    for task_ref in tasks_str.split(','):
+                for target_value in (on_success, on_failure):
+                    if target_value is not None:
                         try:
-                            ref_id = int(task_ref.strip())
-                            if ref_id in task_ids:
-                                task_graph[task_id].add(ref_id)
+                            target = int(target_value)
+                            if target in task_ids:
+                                edges.add(target)
                         except ValueError:
                             pass
 
+                # Add parallel task references
+                if task_type == 'parallel' and 'tasks' in task:
+                    self._add_subtask_edges(edges, task, line_number, 'tasks', task_ids)
+
                 # Add conditional task references
-                if task.get('type') == 'conditional':
+                if task_type == 'conditional':
                     for field in ['if_true_tasks', 'if_false_tasks']:
                         if field in task:
-                            tasks_str = task[field]
-                            for task_ref in tasks_str.split(','):
-                                try:
-                                    ref_id = int(task_ref.strip())
-                                    if ref_id in task_ids:
-                                        task_graph[task_id].add(ref_id)
-                                except ValueError:
-                                    pass
+                            self._add_subtask_edges(edges, task, line_number, field, task_ids)
 
             except (ValueError, TypeError):
                 continue
@@ -1496,32 +1694,31 @@ class TaskValidator:
 
         # Perform breadth-first traversal to find all reachable tasks
         reachable = set()
-        queue = [start_task]
+        queue = deque([start_task])
         reachable.add(start_task)
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if current in task_graph:
                 for next_task in task_graph[current]:
                     if next_task not in reachable:
                         reachable.add(next_task)
                         queue.append(next_task)
 
-        # Find unreachable tasks
+        # Find unreachable tasks (the common case is none, so nothing to sort or report)
         unreachable = task_ids - reachable
+        if not unreachable:
+            return
 
         # Special handling: Tasks in special ranges might be intentionally unreachable
-        # (e.g., error handlers that are only jumped to via on_failure)
-        special_ranges = [(90, 99), (100, 999)]
-
+        # (e.g., error handlers that are only jumped to via on_failure).
+        # The 90-99 and 100-999 ranges are contiguous, so one bounds check covers both.
         for task_id in sorted(unreachable):
             # Check if this task is explicitly referenced somewhere
-            is_referenced = (task_id in referenced_tasks or
-                           task_id in parallel_tasks or
-                           task_id in conditional_tasks)
+            is_referenced = task_id in explicitly_referenced
 
             # Check if in special range
-            in_special_range = any(start <= task_id <= end for start, end in special_ranges)
+            in_special_range = SPECIAL_TASK_ID_MIN <= task_id <= SPECIAL_TASK_ID_MAX
 
             if is_referenced:
                 # Task is referenced but not reachable from start - this is often intentional
@@ -1538,6 +1735,27 @@ class TaskValidator:
                     f"It will never execute. Consider removing it or adding a reference."
                 )
 
+    def _add_subtask_edges(self, edges, task, line_number, field_name, task_ids):
+        """
+        Add graph edges for the subtask IDs listed in a parallel/conditional field.
+
+        Reuses the list already parsed by validate_parallel_task/validate_conditional_task_list
+        when available. Otherwise (e.g. the field failed validation) the field is parsed
+        leniently, skipping references that are not integers.
+        """
+        ref_ids = self._subtask_ids.get((line_number, field_name))
+        if ref_ids is None:
+            ref_ids = []
+            for task_ref in task[field_name].split(','):
+                try:
+                    ref_ids.append(int(task_ref.strip()))
+                except ValueError:
+                    pass
+
+        for ref_id in ref_ids:
+            if ref_id in task_ids:
+                edges.add(ref_id)
+
     def check_unexpanded_used_variables(self):
         """
         Validate that used global variables have successfully expanded environment variables.
@@ -1619,40 +1837,54 @@ class TaskValidator:
             line_number (int): Line number in the source file for generating location-aware error/warning messages.
         """
 
+        # Templated values are memoized by resolve_global_variables_for_validation itself
+        def resolve_field(field_name):
+            value = task.get(field_name, '')
+            # Literal values (numeric timeout/loop/sleep/return, plain commands) need no resolving
+            if '@' not in value:
+                return value
+            return self.resolve_global_variables_for_validation(value)
+
+        # Task type and field presence are consulted by most checks below, look them up once
+        task_type = task.get('type')
+        is_parallel = task_type == 'parallel'
+        is_conditional = task_type == 'conditional'
+        is_decision = task_type == 'decision'
+        is_parallel_or_conditional = is_parallel or is_conditional
+        has_command = 'command' in task
+        has_hostname = 'hostname' in task
+        has_return = 'return' in task
+
         # Check that hostname has a value if it exists (except for local execution, parallel, and conditional tasks)
-        if 'hostname' in task:
+        if has_hostname:
             # Skip hostname validation for parallel and conditional tasks
-            if task.get('type') not in ['parallel', 'conditional']:  # NEW: Skip conditional tasks
-                hostname_resolved = self.resolve_global_variables_for_validation(task['hostname'])
+            if not is_parallel_or_conditional:  # NEW: Skip conditional tasks
+                hostname_resolved = resolve_field('hostname')
                 if not hostname_resolved or hostname_resolved == '':
                     # Check if this is not local execution
-                    exec_resolved = self.resolve_global_variables_for_validation(task.get('exec', ''))
+                    exec_resolved = resolve_field('exec')
                     if exec_resolved != 'local':
                         self.errors.append(f"Line {line_number}: Task {task_id} has empty hostname but execution type requires one.")
 
         # Validate 'next' field - simplified syntax for parallel and conditional tasks
         if 'next' in task:
             next_value = task['next']
-            is_parallel_or_conditional = task.get('type') in ['parallel', 'conditional']  # NEW: Include conditional
-            
+
             # Handle direct modifiers (min_success=N, max_failed=N, etc.)
-            if '=' in next_value and next_value.split('=')[0] in self.valid_direct_modifiers:
+            modifier_end = next_value.find('=')
+            if modifier_end > 0 and next_value[:modifier_end] in self.valid_direct_modifiers:
                 if not is_parallel_or_conditional:  # NEW: Allow for both parallel and conditional
                     self.errors.append(f"Line {line_number}: Task {task_id} uses parallel/conditional-specific next condition '{next_value}' but is not a parallel or conditional task.")
                 else:
                     self.validate_direct_modifier_condition(next_value, task_id, line_number)
             else:
                 # Check for standard special values
-                special_value_found = None
-                for special in self.valid_next_values:
-                    if next_value == special:
-                        special_value_found = special
-                        break
-                
+                special_value_found = next_value if next_value in self.valid_next_values else None
+
                 if special_value_found:
                     # Handle backwards compatibility for 'success' in parallel/conditional tasks
                     if special_value_found == 'success' and is_parallel_or_conditional:
-                        self.warnings.append(f"Line {line_number}: Task {task_id} uses 'next=success' in {task.get('type', 'parallel/conditional')} task. Consider using 'all_success' for clarity. Will be treated as 'all_success'.")
+                        self.warnings.append(f"Line {line_number}: Task {task_id} uses 'next=success' in {task_type or 'parallel/conditional'} task. Consider using 'all_success' for clarity. Will be treated as 'all_success'.")
                     
                     # Parallel/Conditional-specific validations
                     elif special_value_found in ['all_success', 'any_success', 'majority_success'] and not is_parallel_or_conditional:
@@ -1669,19 +1901,6 @@ class TaskValidator:
                         # Not a special value, validate as condition expression
                         self.validate_condition_expression(next_value, 'next', task_id, line_number)
 
-        # CRITICAL: Validate that 'next' and 'on_success'/'on_failure' are mutually exclusive
-        if 'next' in task:
-            if 'on_success' in task or 'on_failure' in task:
-                conflicting_fields = []
-                if 'on_success' in task:
-                    conflicting_fields.append('on_success')
-                if 'on_failure' in task:
-                    conflicting_fields.append('on_failure')
-                self.errors.append(
-                    f"Line {line_number}: Task {task_id} cannot use 'next' together with {', '.join(conflicting_fields)}. "
-                    "Use either 'next' for conditional flow OR 'on_success'/'on_failure' for explicit routing, not both."
-                )
-
         # Flexible routing: on_success and on_failure can be used independently
         # Pattern 1: on_failure ONLY → success continues to next task, failure jumps to handler
         # Pattern 2: on_success ONLY → success jumps to target, failure exits with code 10
@@ -1689,39 +1908,49 @@ class TaskValidator:
         has_on_success = 'on_success' in task
         has_on_failure = 'on_failure' in task
 
+        # CRITICAL: Validate that 'next' and 'on_success'/'on_failure' are mutually exclusive
+        if 'next' in task and (has_on_success or has_on_failure):
+            conflicting_fields = self._ROUTING_CONFLICT_FIELDS[(has_on_success, has_on_failure)]
+            self.errors.append(
+                f"Line {line_number}: Task {task_id} cannot use 'next' together with {conflicting_fields}. "
+                "Use either 'next' for conditional flow OR 'on_success'/'on_failure' for explicit routing, not both."
+            )
+
+        # Parse each routing target once; the forward-only checks below reuse the result
+        on_success_raw = task.get('on_success')
+        on_failure_raw = task.get('on_failure')
+        on_success_target = self._parse_integer(on_success_raw)
+        on_failure_target = self._parse_integer(on_failure_raw)
+
         # Validate on_success target if present
         if has_on_success:
-            try:
-                on_success_target = int(task['on_success'])
-                if on_success_target < 0 or on_success_target > 9999:
-                    self.errors.append(
-                        f"Line {line_number}: Task {task_id} has invalid 'on_success' target: {on_success_target}"
-                    )
-            except (ValueError, TypeError):
+            if on_success_target is None:
                 self.errors.append(
-                    f"Line {line_number}: Task {task_id} has invalid 'on_success' value: '{task['on_success']}'"
+                    f"Line {line_number}: Task {task_id} has invalid 'on_success' value: '{on_success_raw}'"
+                )
+            elif on_success_target < 0 or on_success_target > 9999:
+                self.errors.append(
+                    f"Line {line_number}: Task {task_id} has invalid 'on_success' target: {on_success_target}"
                 )
 
         # Validate on_failure target if present
         if has_on_failure:
-            try:
-                on_failure_target = int(task['on_failure'])
-                if on_failure_target < 0 or on_failure_target > 9999:
-                    self.errors.append(
-                        f"Line {line_number}: Task {task_id} has invalid 'on_failure' target: {on_failure_target}"
-                    )
-            except (ValueError, TypeError):
+            if on_failure_target is None:
+                self.errors.append(
+                    f"Line {line_number}: Task {task_id} has invalid 'on_failure' value: '{on_failure_raw}'"
+                )
+            elif on_failure_target < 0 or on_failure_target > 9999:
                 self.errors.append(
-                    f"Line {line_number}: Task {task_id} has invalid 'on_failure' value: '{task['on_failure']}'"
+                    f"Line {line_number}: Task {task_id} has invalid 'on_failure' target: {on_failure_target}"
                 )
 
         # Skip success/failure validation for decision blocks (handled in validate_decision_task)
-        if task.get('type') != 'decision':
+        if not is_decision:
             # Validate 'success' field
             if 'success' in task:
                 success_value = task['success']
                 # For parallel/conditional blocks, validate as multi-task condition
-                if task.get('type') in ['parallel', 'conditional']:
+                if is_parallel_or_conditional:
                     # Check if it's a valid multi-task evaluation condition
                     self.validate_direct_modifier_condition(success_value, task_id, line_number, field_name='success')
                 else:
@@ -1751,8 +1980,8 @@ class TaskValidator:
             self.validate_condition_expression(loop_break_value, 'loop_break', task_id, line_number)
 
         # Validate 'command' field (skip for parallel, conditional, and decision tasks)
-        if 'command' in task and task.get('type') not in ['parallel', 'conditional', 'decision']:  # NEW: Skip decision tasks
-            command_resolved = self.resolve_global_variables_for_validation(task['command'])
+        if has_command and not (is_parallel_or_conditional or is_decision):  # NEW: Skip decision tasks
+            command_resolved = resolve_field('command')
             command_clean = self.clean_field_value(command_resolved)
             if command_clean == '':
                 self.errors.append(f"Line {line_number}: Task {task_id} has empty command value.")
@@ -1760,25 +1989,21 @@ class TaskValidator:
                 self.warnings.append(f"Line {line_number}: Task {task_id} has spaces in command: '{command_clean}'. Use the 'arguments' field for arguments")
 
         # Check that we have either command+hostname OR return OR parallel type OR conditional type
-        has_command = 'command' in task and self.resolve_global_variables_for_validation(task['command']).strip()
-        has_hostname = 'hostname' in task and self.resolve_global_variables_for_validation(task['hostname']).strip()
-        has_return = 'return' in task
-        is_parallel = task.get('type') == 'parallel'
-        is_conditional = task.get('type') == 'conditional'  # NEW: Check for conditional
-        is_decision = task.get('type') == 'decision'  # NEW: Check for decision
+        command_present = has_command and resolve_field('command').strip()
+        hostname_present = has_hostname and resolve_field('hostname').strip()
 
         # Special case for local execution (doesn't need hostname)
-        exec_resolved = self.resolve_global_variables_for_validation(task.get('exec', ''))
+        exec_resolved = resolve_field('exec')
         is_local_exec = (self.clean_field_value(exec_resolved) or '').lower() == 'local'
 
-        valid_task = (has_return or is_parallel or is_conditional or is_decision or (has_command and (has_hostname or is_local_exec)))  # NEW: Include decision
+        valid_task = (has_return or is_parallel or is_conditional or is_decision or (command_present and (hostname_present or is_local_exec)))  # NEW: Include decision
 
         if not valid_task:
             self.errors.append(f"Line {line_number}: Task {task_id} must have either a command+hostname, a return value, or be a parallel/conditional/decision task.")
 
         # Validate 'return' field
-        if 'return' in task:
-            return_resolved = self.resolve_global_variables_for_validation(task['return'])
+        if has_return:
+            return_resolved = resolve_field('return')
             return_clean = self.clean_field_value(return_resolved)
             try:
                 return_code = int(return_clean)
@@ -1788,32 +2013,30 @@ class TaskValidator:
                 self.errors.append(f"Line {line_number}: Task {task_id} has invalid return code: '{return_clean}'.")
 
         # Validate 'on_failure' field
-        if 'on_failure' in task:
-            on_failure_resolved = self.resolve_global_variables_for_validation(task['on_failure'])
-            on_failure_clean = self.clean_field_value(on_failure_resolved)
-            try:
-                on_failure_task = int(on_failure_clean)
-                # Forward-only validation: prevent backward jumps to avoid infinite loops
-                if on_failure_task <= task_id:
-                    self.errors.append(f"Line {line_number}: Task {task_id} 'on_failure' cannot jump backwards to task {on_failure_task} (forward-only rule to prevent infinite loops).")
-            except ValueError:
+        if has_on_failure:
+            on_failure_clean = self.clean_field_value(resolve_field('on_failure'))
+            # Literal targets were already parsed above; only resolved templates need parsing
+            on_failure_task = on_failure_target if on_failure_clean == on_failure_raw else self._parse_integer(on_failure_clean)
+            if on_failure_task is None:
                 self.errors.append(f"Line {line_number}: Task {task_id} has invalid 'on_failure' task: '{on_failure_clean}'.")
+            # Forward-only validation: prevent backward jumps to avoid infinite loops
+            elif on_failure_task <= task_id:
+                self.errors.append(f"Line {line_number}: Task {task_id} 'on_failure' cannot jump backwards to task {on_failure_task} (forward-only rule to prevent infinite loops).")
 
         # Validate 'on_success' field
-        if 'on_success' in task:
-            on_success_resolved = self.resolve_global_variables_for_validation(task['on_success'])
-            on_success_clean = self.clean_field_value(on_success_resolved)
-            try:
-                on_success_task = int(on_success_clean)
-                # Forward-only validation: prevent backward jumps to avoid infinite loops
-                if on_success_task <= task_id:
-                    self.errors.append(f"Line {line_number}: Task {task_id} 'on_success' cannot jump backwards to task {on_success_task} (forward-only rule to prevent infinite loops).")
-            except ValueError:
+        if has_on_success:
+            on_success_clean = self.clean_field_value(resolve_field('on_success'))
+            # Literal targets were already parsed above; only resolved templates need parsing
+            on_success_task = on_success_target if on_success_clean == on_success_raw else self._parse_integer(on_success_clean)
+            if on_success_task is None:
                 self.errors.append(f"Line {line_number}: Task {task_id} has invalid 'on_success' task: '{on_success_clean}'.")
+            # Forward-only validation: prevent backward jumps to avoid infinite loops
+            elif on_success_task <= task_id:
+                self.errors.append(f"Line {line_number}: Task {task_id} 'on_success' cannot jump backwards to task {on_success_task} (forward-only rule to prevent infinite loops).")
 
         # Validate 'loop' field
         if 'loop' in task:
-            loop_resolved = self.resolve_global_variables_for_validation(task['loop'])
+            loop_resolved = resolve_field('loop')
             loop_clean = self.clean_field_value(loop_resolved)
             try:
                 loop_count = int(loop_clean)
@@ -1832,7 +2055,7 @@ class TaskValidator:
 
         # Validate 'sleep' field
         if 'sleep' in task:
-            sleep_resolved = self.resolve_global_variables_for_validation(task['sleep'])
+            sleep_resolved = resolve_field('sleep')
             sleep_clean = self.clean_field_value(sleep_resolved)
             try:
                 sleep_time = float(sleep_clean)
@@ -1844,17 +2067,10 @@ class TaskValidator:
         # Validate 'timeout' field
         if 'timeout' in task:
             # Skip timeout validation for parallel/conditional/decision tasks - they have their own specific validation
-            is_parallel = task.get('type') == 'parallel'
-            is_conditional = task.get('type') == 'conditional'
-            is_decision = task.get('type') == 'decision'
-
             if not is_parallel and not is_conditional and not is_decision:
                 # CRITICAL: Timeout can only be used on tasks that execute commands
                 # Tasks without commands (return) don't execute anything
-                has_command = 'command' in task
-                is_return_task = 'return' in task
-
-                if not has_command or is_return_task:
+                if not has_command or has_return:
                     # Concise error for INFO level
                     self.errors.append(
                         f"Line {line_number}: Task {task_id} cannot use 'timeout' parameter."
@@ -1866,7 +2082,7 @@ class TaskValidator:
                     )
                 else:
                     # Validate timeout value if task has command
-                    timeout_resolved = self.resolve_global_variables_for_validation(task['timeout'])
+                    timeout_resolved = resolve_field('timeout')
                     timeout_clean = self.clean_field_value(timeout_resolved)
                     try:
                         timeout = int(timeout_clean)
@@ -1879,26 +2095,22 @@ class TaskValidator:
         
         if 'exec' in task:
             # Resolve placeholders and validate exec type
-            exec_resolved = self.resolve_global_variables_for_validation(task['exec'])
+            exec_resolved = resolve_field('exec')
             exec_clean = self.clean_field_value(exec_resolved).lower()
-            valid_exec_types = ['pbrun','p7s','local','wwrs','shell']
-
-            # Common aliases that map to shell (don't warn for these)
-            known_aliases = ['sh', 'bash', '/bin/sh', '/bin/bash']
 
-            if exec_clean not in valid_exec_types and exec_clean not in known_aliases:
-                self.warnings.append(f"Line {line_number}: Task {task_id} has unknown execution_type: '{exec_clean}'. Valid types are: {','.join(valid_exec_types)} (aliases: sh, bash)")
+            # Common aliases that map to shell are accepted too (don't warn for these)
+            if exec_clean not in self._KNOWN_EXEC_VALUES:
+                self.warnings.append(f"Line {line_number}: Task {task_id} has unknown execution_type: '{exec_clean}'. Valid types are: {','.join(self._VALID_EXEC_TYPES)} (aliases: sh, bash)")
         
         # Validate split specifications
         for split_field in ['stdout_split', 'stderr_split']:
             if split_field in task:
-                split_resolved = self.resolve_global_variables_for_validation(task[split_field])
+                split_resolved = resolve_field(split_field)
                 split_clean = self.clean_field_value(split_resolved)
-                parts = split_clean.split(',')
-                if len(parts) != 2:
+                delimiter, separator, index = split_clean.partition(',')
+                if not separator or ',' in index:
                     self.errors.append(f"Line {line_number}: Task {task_id} has invalid {split_field} format: '{split_clean}'. Should be 'delimiter,index'.")
                 else:
-                    delimiter, index = parts
                     if delimiter not in self.known_delimiters and not self.is_valid_custom_delimiter(delimiter):
                         self.warnings.append(f"Line {line_number}: Task {task_id} uses unknown delimiter: '{delimiter}' in {split_field}.")
                     try:
@@ -1913,32 +2125,37 @@ class TaskValidator:
         # Examples: min_success=2, max_failed=1, all_success, any_success
 
         # Check for simple multi-task conditions (no '=' sign)
-        simple_conditions = ['all_success', 'any_success', 'majority_success']
-        if condition in simple_conditions:
+        if condition in _SIMPLE_MULTI_TASK_CONDITIONS:
             return  # These are valid
 
         if '=' not in condition:
             self.errors.append(f"Line {line_number}: Task {task_id} has invalid {field_name} condition: '{condition}'. "
-                             f"Valid formats: 'modifier=value' or one of {simple_conditions}")
+                             f"Valid formats: 'modifier=value' or one of {sorted(_SIMPLE_MULTI_TASK_CONDITIONS)}")
             return
 
         key, value = condition.split('=', 1)
         
         if key not in self.valid_direct_modifiers:
-            self.errors.append(f"Line {line_number}: Task {task_id} has unknown modifier: '{key}'. Valid: {self.valid_direct_modifiers}")
+            self.errors.append(f"Line {line_number}: Task {task_id} has unknown modifier: '{key}'. Valid: {sorted(self.valid_direct_modifiers)}")
             return
             
-        try:
-            int_value = int(value)
-            if int_value < 0:
-                self.errors.append(f"Line {line_number}: Task {task_id} has negative value in modifier: '{condition}'")
-            elif int_value == 0 and key in ['min_success', 'min_failed']:
-                self.warnings.append(f"Line {line_number}: Task {task_id} has zero value for '{key}' - this might always be true")
-        except ValueError:
+        int_value = self._parse_integer(value.strip())
+        if int_value is None:
             self.errors.append(f"Line {line_number}: Task {task_id} has invalid integer in modifier: '{condition}'")
+        elif int_value < 0:
+            self.errors.append(f"Line {line_number}: Task {task_id} has negative value in modifier: '{condition}'")
+        elif int_value == 0 and key in ['min_success', 'min_failed']:
+            self.warnings.append(f"Line {line_number}: Task {task_id} has zero value for '{key}' - this might always be true")
 
     def validate_condition_expression(self, expression, field_name, task_id, line_number):
-        """Enhanced condition validation with global variable support."""
+        """
+        Enhanced condition validation with global variable support.
+
+        Identical conditions (e.g. 'exit_0' or 'stdout~OK') recur across many tasks.
+        Each (condition, field_name) pair is checked once; the resulting errors/warnings
+        are stored without their "Line N: Task M " prefix and replayed with the current
+        task's location on later hits, together with the global variables it references.
+        """
         if not expression:
             self.errors.append(f"Line {line_number}: Task {task_id} has empty {field_name} condition.")
             return
@@ -1946,87 +2163,123 @@ class TaskValidator:
         # Clean the expression (remove extra whitespace)
         expression_clean = self.clean_field_value(expression)
 
-        # Check for balanced parentheses
-        if expression_clean.count('(') != expression_clean.count(')'):
-            self.errors.append(f"Line {line_number}: Task {task_id} has unbalanced parentheses in {field_name}: '{expression_clean}'")
+        prefix = f"Line {line_number}: Task {task_id} "
+        cache_key = (expression_clean, field_name)
+        cached = self._condition_cache.get(cache_key)
+        if cached is not None:
+            cached_errors, cached_warnings, referenced_vars = cached
+            self.errors.extend(prefix + message for message in cached_errors)
+            self.warnings.extend(prefix + message for message in cached_warnings)
+            self.referenced_global_vars.update(referenced_vars)
             return
 
+        errors_start = len(self.errors)
+        warnings_start = len(self.warnings)
+
+        referenced_vars = self._check_condition_expression(expression_clean, field_name, task_id, line_number)
+
+        new_errors = self.errors[errors_start:]
+        new_warnings = self.warnings[warnings_start:]
+        # Only cache when every message carries the standard location prefix
+        if all(message.startswith(prefix) for message in new_errors + new_warnings):
+            self._condition_cache[cache_key] = (
+                tuple(message[len(prefix):] for message in new_errors),
+                tuple(message[len(prefix):] for message in new_warnings),
+                referenced_vars
+            )
+
+    def _check_condition_expression(self, expression_clean, field_name, task_id, line_number):
+        """
+        Run all checks for a cleaned condition expression.
+
+        Returns the global variable names the condition references.
+        """
+        referenced_vars = []
+
+        # Check for balanced parentheses (the same pass locates operators inside parentheses)
+        open_count, close_count, operator_index = self._scan_parentheses(expression_clean)
+        if open_count != close_count:
+            self.errors.append(f"Line {line_number}: Task {task_id} has unbalanced parentheses in {field_name}: '{expression_clean}'")
+            return referenced_vars
+
         # Check for basic syntax issues
         if expression_clean.startswith(('&', '|')) or expression_clean.endswith(('&', '|')):
             self.errors.append(f"Line {line_number}: Task {task_id} has invalid {field_name} syntax: '{expression_clean}'")
-            return
+            return referenced_vars
 
         # Check for double operators
         for op in ['&&', '||']:
             if op in expression_clean:
                 self.errors.append(f"Line {line_number}: Task {task_id} has double operator in {field_name}: '{expression_clean}'")
-                return
+                return referenced_vars
 
         # Validate global variable references in conditions
-        global_var_pattern = r'@([a-zA-Z_][a-zA-Z0-9_]*)@'
-        global_matches = re.findall(global_var_pattern, expression_clean)
-
-        for var_name in global_matches:
-            # Skip task result variables
-            # CASE INSENSITIVE: Accept @0_STDOUT@, @0_stdout@, etc.
-            task_var_pattern = r'\d+_(stdout|stderr|success|exit)$'
-            if re.match(task_var_pattern, var_name, re.IGNORECASE):
-                continue
-
-            # Track usage
-            self.referenced_global_vars.add(var_name)
-
-            # Check if defined
-            if var_name not in self.global_vars:
-                self.errors.append(
-                    f"Line {line_number}: Task {task_id} {field_name} condition references "
-                    f"undefined global variable '@{var_name}@'"
-                )
+        # (each regex below is skipped when a plain substring test shows it cannot match)
+        if '@' in expression_clean:
+            # Task result variables (@0_stdout@, @0_STDOUT@, etc.) are never matched here
+            for var_name in _GLOBAL_VAR_PATTERN.findall(expression_clean):
+                # Track usage
+                self.referenced_global_vars.add(var_name)
+                referenced_vars.append(var_name)
+
+                # Check if defined
+                if var_name not in self.global_vars:
+                    self.errors.append(
+                        f"Line {line_number}: Task {task_id} {field_name} condition references "
+                        f"undefined global variable '@{var_name}@'"
+                    )
 
         # For validation purposes, try to resolve global variables to check syntax
         resolved_expression = self.resolve_global_variables_for_validation(expression_clean)
 
         # Check for valid exit code patterns in the resolved expression
-        exit_conditions = re.findall(r'exit_(\d+)', resolved_expression)
-        for exit_code in exit_conditions:
-            try:
+        if 'exit_' in resolved_expression:
+            for exit_code in _EXIT_CODE_PATTERN.findall(resolved_expression):
+                # The pattern only captures digits, so int() cannot fail here
                 code = int(exit_code)
                 if code > 255:
                     self.warnings.append(f"Line {line_number}: Task {task_id} has unusual exit code in {field_name}: exit_{code}")
-            except ValueError:
-                self.errors.append(f"Line {line_number}: Task {task_id} has invalid exit code in {field_name}: exit_{exit_code}")
 
         # Check for common invalid condition syntax patterns
         # Pattern 1: exit=X instead of exit_X (equals instead of underscore)
-        invalid_exit_equals = re.findall(r'exit=(\d+)', resolved_expression)
-        if invalid_exit_equals:
-            for code in invalid_exit_equals:
+        if 'exit=' in resolved_expression:
+            for code in _INVALID_EXIT_EQUALS_PATTERN.findall(resolved_expression):
                 self.errors.append(f"Line {line_number}: Task {task_id} has invalid syntax in {field_name}: 'exit={code}'. Use 'exit_{code}' instead.")
 
+        # Without global variables the text is unchanged and the parenthesis scan can be reused
+        if resolved_expression != expression_clean:
+            operator_index = None
+        self._validate_condition_syntax(resolved_expression, field_name, task_id, line_number, operator_index)
+
+        return referenced_vars
+
+    def _validate_condition_syntax(self, resolved_expression, field_name, task_id, line_number, operator_index=None):
+        """
+        Run the structural syntax checks for a resolved condition expression.
+
+        operator_index is the result of _scan_parentheses for resolved_expression
+        when the caller already has it (None to scan here).
+        """
         # CRITICAL: Check for operators inside parentheses (not supported)
         # Parentheses can only wrap simple conditions, not complex expressions
-        if self._check_operators_inside_parentheses(resolved_expression, field_name, task_id, line_number):
-            return  # Don't continue validation if this error exists
-
-        # CRITICAL: Validate individual condition parts after splitting on operators
-        # This catches malformed conditions like "stdout~FAILED,exit_2"
-        self.validate_condition_parts(resolved_expression, field_name, task_id, line_number)
+        # Don't continue validation if this error exists
+        if not self._check_operators_inside_parentheses(resolved_expression, field_name, task_id, line_number, operator_index):
+            # CRITICAL: Validate individual condition parts after splitting on operators
+            # This catches malformed conditions like "stdout~FAILED,exit_2"
+            self.validate_condition_parts(resolved_expression, field_name, task_id, line_number)
 
     def validate_condition_parts(self, expression, field_name, task_id, line_number):
         """
         Validate individual condition parts after splitting on boolean operators.
         This ensures each part is a valid simple condition.
         """
-        # Split on operators while preserving the structure
-        # Handle ONLY |, & operators (not word operators)
+        # Split only on symbol operators (& and |), not word operators
         parts = []
-
-        # Split only on symbol operators (& and |)
-        sub_parts = re.split(r'([|&])', expression)
-        for sub_part in sub_parts:
-            # Skip empty parts and operator symbols
-            if sub_part.strip() and sub_part not in ['|', '&']:
-                parts.append(sub_part.strip())
+        for sub_part in self._split_on_operators(expression):
+            # Skip empty parts
+            sub_part = sub_part.strip()
+            if sub_part:
+                parts.append(sub_part)
 
         # Validate each part is a valid simple condition
         for part in parts:
@@ -2039,10 +2292,12 @@ class TaskValidator:
 
             # Strip all leading '(' and trailing ')' characters
             # This handles both complete groups like '(stdout~OK)' and split fragments like '(exit_0'
+            # Each pass removes a whole run of parentheses; another pass is only needed
+            # when whitespace separates them, e.g. '( (exit_0'
             while stripped_part.startswith('('):
-                stripped_part = stripped_part[1:].strip()
+                stripped_part = stripped_part.lstrip('(').lstrip()
             while stripped_part.endswith(')'):
-                stripped_part = stripped_part[:-1].strip()
+                stripped_part = stripped_part.rstrip(')').rstrip()
 
             # Skip empty results after stripping
             if not stripped_part:
@@ -2051,6 +2306,12 @@ class TaskValidator:
             # Validate that the part matches known condition patterns
             self.validate_simple_condition_syntax(stripped_part, field_name, task_id, line_number)
 
+    @staticmethod
+    def _split_on_operators(expression):
+        """Split a condition on '&' and '|' operators, dropping the operator symbols."""
+        # Two C-level string passes instead of a regex split that also returns the separators
+        return expression.replace('&', '|').split('|')
+
     def validate_simple_condition_syntax(self, condition, field_name, task_id, line_number):
         """
         Validate that a simple condition (no boolean operators) follows valid syntax.
@@ -2069,37 +2330,12 @@ class TaskValidator:
         if not condition:
             return
 
-        # Valid patterns
-        # CASE INSENSITIVE: Accept both @0_stdout@ and @0_STDOUT@, stdout~ and STDOUT~, etc.
-        valid_patterns = [
-            r'^exit_\d+$',                           # exit_0, exit_1, etc.
-            r'^exit_not_0$',                         # exit_not_0
-            r'^stdout~',                             # stdout pattern matching
-            r'^stdout!~',                            # stdout pattern not matching
-            r'^stdout(=|!=)',                        # stdout equality/inequality
-            r'^stdout(<|<=|>|>=)',                   # stdout numeric comparison
-            r'^stdout_count[=<>]',                   # stdout_count with operators
-            r'^stderr~',                             # stderr pattern matching
-            r'^stderr!~',                            # stderr pattern not matching
-            r'^stderr(=|!=)',                        # stderr equality/inequality
-            r'^stderr(<|<=|>|>=)',                   # stderr numeric comparison
-            r'^stderr_count[=<>]',                   # stderr_count with operators
-            r'^(true|false)$',                       # boolean literals
-            r'^success$',                            # success keyword
-            r'^[a-zA-Z_]\w*[=!<>~]',                # variable comparisons
-            r'^exit[=!<>]',                          # exit comparisons (current task)
-            r'^@\d+_(stdout|stderr|success|exit)@$',  # standalone task result placeholders
-            r'^@\d+_(stdout|stderr|success|exit)@[=!<>~]',  # task result comparisons
-            r'^contains:',                           # legacy contains
-            r'^not_contains:',                       # legacy not_contains
-        ]
-
         # Check if condition matches any valid pattern (case-insensitive)
-        is_valid = any(re.match(pattern, condition, re.IGNORECASE) for pattern in valid_patterns)
+        is_valid = _VALID_CONDITION_PATTERN.match(condition) is not None
 
         if not is_valid:
             # Provide helpful error message
-            if re.match(r'^\w+,', condition):
+            if _COMMA_HINT_PATTERN.match(condition):
                 self.errors.append(
                     f"Line {line_number}: Task {task_id} has invalid {field_name} condition: '{condition}'. "
                     f"Did you mean to use '|' (OR) instead of ',' (comma)?"
@@ -2110,78 +2346,78 @@ class TaskValidator:
                     f"Valid patterns: exit_N, stdout/stderr operators (~, =, !=, <, >, etc.), task result placeholders (@N_stdout@, @N_stderr@, @N_success@, @N_exit@), variable comparisons, boolean literals (true/false)."
                 )
 
-    def _check_operators_inside_parentheses(self, condition, field_name, task_id, line_number):
+    @staticmethod
+    def _scan_parentheses(expression):
         """
-        Check if operators (&, |) exist inside parentheses and reject them.
-        Parentheses should only wrap simple conditions, not complex expressions.
+        Scan an expression once for parenthesis balance and operators inside parentheses.
 
-        Supported:   (exit_0), (stdout~OK), (exit_0)&(stdout~OK)
-        Unsupported: (exit_0&stdout~OK), (exit_0|exit_1)
-
-        Returns True if error found, False otherwise.
+        Returns (open_count, close_count, operator_index) where operator_index is the
+        position of the first '&' or '|' inside parentheses, or -1 if there is none.
         """
-        import re
-
+        # Most conditions have no parentheses or no operators at all; C-level
+        # substring tests and counts settle those without a per-character loop
+        if '(' not in expression or ('&' not in expression and '|' not in expression):
+            return expression.count('('), expression.count(')'), -1
+
+        open_count = 0
+        close_count = 0
+        operator_index = -1
         depth = 0
         inside_parens = False
-        paren_start = -1
 
-        for i, char in enumerate(condition):
+        for i, char in enumerate(expression):
             if char == '(':
-                if depth == 0:
-                    paren_start = i
+                open_count += 1
                 depth += 1
                 inside_parens = True
             elif char == ')':
+                close_count += 1
                 depth -= 1
                 if depth == 0:
                     inside_parens = False
-                    paren_start = -1
-            elif inside_parens and char in ['&', '|']:
-                # Extract context around the error for better error message
-                start = max(0, i - 20)
-                end = min(len(condition), i + 20)
-                context = condition[start:end]
+            elif inside_parens and operator_index < 0 and (char == '&' or char == '|'):
+                operator_index = i
 
-                self.errors.append(
-                    f"Line {line_number}: Task {task_id} has operators inside parentheses in '{field_name}' condition. "
-                    f"Context: '...{context}...' "
-                    f"Parentheses can only wrap simple conditions, not complex expressions. "
-                    f"Use operators OUTSIDE parentheses: '(exit_0)&(stdout~OK)' instead of '(exit_0&stdout~OK)'. "
-                    f"For complex grouping, wait for JSON/YAML support (see Future Features)."
-                )
-                return True  # Found error
+        return open_count, close_count, operator_index
+
+    def _check_operators_inside_parentheses(self, condition, field_name, task_id, line_number, operator_index=None):
+        """
+        Check if operators (&, |) exist inside parentheses and reject them.
+        Parentheses should only wrap simple conditions, not complex expressions.
+
+        Supported:   (exit_0), (stdout~OK), (exit_0)&(stdout~OK)
+        Unsupported: (exit_0&stdout~OK), (exit_0|exit_1)
 
-        return False  # No error
+        Returns True if error found, False otherwise.
+        """
+        if operator_index is None:
+            _, _, operator_index = self._scan_parentheses(condition)
+
+        if operator_index < 0:
+            return False  # No error
+
+        # Extract context around the error for better error message
+        start = max(0, operator_index - 20)
+        end = min(len(condition), operator_index + 20)
+        context = condition[start:end]
+
+        self.errors.append(
+            f"Line {line_number}: Task {task_id} has operators inside parentheses in '{field_name}' condition. "
+            f"Context: '...{context}...' "
+            f"Parentheses can only wrap simple conditions, not complex expressions. "
+            f"Use operators OUTSIDE parentheses: '(exit_0)&(stdout~OK)' instead of '(exit_0&stdout~OK)'. "
+            f"For complex grouping, wait for JSON/YAML support (see Future Features)."
+        )
+        return True  # Found error
 
     def is_valid_custom_delimiter(self, delimiter):
         """Check if a custom delimiter is valid."""
         # A valid custom delimiter is a non-empty string
         return delimiter and isinstance(delimiter, str)
 
-    def collect_referenced_tasks(self, task, referenced_tasks):
-        """Collect task IDs that are referenced in variables and on_failure/on_success fields."""
-        # Check for @X_stdout@, @X_stderr@, @X_success@, or @X_exit@ references
-        for _, value in task.items():
-            if isinstance(value, str):
-                for match in re.finditer(r'@(\d+)_(stdout|stderr|success|exit)@', value, re.IGNORECASE):
-                    try:
-                        ref_task = int(match.group(1))
-                        referenced_tasks.add(ref_task)
-                    except ValueError:
-                        pass
-        # Check for on_failure references
-        if 'on_failure' in task:
-            try:
-                on_failure_task = int(task['on_failure'])
-                referenced_tasks.add(on_failure_task)
-            except ValueError:
-                pass
-
-        # Check for on_success references
-        if 'on_success' in task:
-            try:
-                on_success_task = int(task['on_success'])
-                referenced_tasks.add(on_success_task)
-            except ValueError:
-                pass
\ No newline at end of file
+    def _collect_routing_targets(self, task, referenced_tasks):
+        """Collect on_failure/on_success task IDs (non-integer values are reported by validate_field_values)."""
+        for routing_field in ('on_failure', 'on_success'):
+            routing_target = self._parse_integer(task.get(routing_field))
+            if routing_target is not None:
+                referenced_tasks.add(routing_target)
\ No newline at end of file
@@ -7,8 +7,10 @@ when multiple TaskExecutor instances are created, avoiding memory leaks
 from stale instance references.
 """
 
+import gc
 import sys
 import os
+import weakref
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -86,6 +88,15 @@ def test_callback_update_on_existing_singleton():
     assert len(executor1_logs) == 1, "First executor should not receive new callbacks"
     print(f"✓ Third executor callback works: {executor3_logs[0]}")
 
+    # Simulate third executor shutting down
+    loader3.clear_debug_callback()
+    loader3.debug_callback("After shutdown")
+
+    assert len(executor3_logs) == 1, "Cleared callback should not receive messages"
+    assert len(executor2_logs) == 1, "Second executor should not receive new callbacks"
+    assert len(executor1_logs) == 1, "First executor should not receive new callbacks"
+    print("✓ Cleared callback is no longer called")
+
     print("\n✅ ALL TESTS PASSED")
     print("   - Singleton pattern works correctly")
     print("   - Callbacks are updated, not accumulated")
@@ -124,10 +135,44 @@ def test_none_callback_doesnt_override():
     return True
 
 
+def test_method_callback_does_not_keep_owner_alive():
+    """Test that a bound-method callback does not keep its owner alive."""
+    print("\nTesting bound-method callback lifetime...")
+
+    class FakeExecutor:
+        def __init__(self):
+            self.logs = []
+
+        def log_debug(self, msg):
+            self.logs.append(msg)
+
+    executor = FakeExecutor()
+    loader = get_loader(debug_callback=executor.log_debug, force_reload=True)
+    executor.logs.clear()
+
+    loader.debug_callback("While executor is alive")
+    assert executor.logs == ["While executor is alive"], f"Unexpected logs: {executor.logs}"
+    assert loader.debug_callback == executor.log_debug, "Loader should return the executor's callback"
+    print("✓ Bound-method callback works while its owner is alive")
+
+    # Drop the executor; the loader must not keep it alive
+    executor_ref = weakref.ref(executor)
+    del executor
+    gc.collect()
+
+    assert executor_ref() is None, "Loader kept the executor alive through its callback"
+    loader.debug_callback("After executor is gone")
+    print("✓ Executor was released and the loader fell back to a no-op callback")
+
+    print("\n✅ Bound-method callback lifetime test passed")
+    return True
+
+
 if __name__ == '__main__':
     try:
         test_callback_update_on_existing_singleton()
         test_none_callback_doesnt_override()
+        test_method_callback_does_not_keep_owner_alive()
         print("\n" + "="*60)
         print("SUCCESS: All ExecConfigLoader callback tests passed!")
         print("="*60)
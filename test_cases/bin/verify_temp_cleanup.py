@@ -5,7 +5,6 @@ This script runs a tasker test file and verifies that temp files are properly cl
 """
 
 import os
-import glob
 import subprocess
 import sys
 import tempfile
@@ -13,10 +12,10 @@ import tempfile
 def get_tasker_temp_files():
     """Get list of existing tasker temp files."""
     temp_dir = tempfile.gettempdir()
-    pattern1 = os.path.join(temp_dir, "tasker_stdout_*")
-    pattern2 = os.path.join(temp_dir, "tasker_stderr_*")
-    files = glob.glob(pattern1) + glob.glob(pattern2)
-    return set(files)
+    # Single pass over the temp directory for both stdout and stderr files
+    with os.scandir(temp_dir) as entries:
+        return {os.path.join(temp_dir, entry.name) for entry in entries
+                if entry.name.startswith(("tasker_stdout_", "tasker_stderr_"))}
 
 def main():
     if len(sys.argv) < 2:
@@ -42,15 +41,17 @@ def main():
     print("")
     print("Running tasker with test file...")
     try:
-        result = subprocess.run(
+        # Single pipe: stderr is merged into stdout, kept only for the failure report
+        with subprocess.Popen(
             [tasker_bin, test_file, "--skip-host-validation", "--skip-security-validation"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            print(f"ERROR: Tasker execution failed with exit code {result.returncode}")
-            print(f"STDOUT: {result.stdout}")
-            print(f"STDERR: {result.stderr}")
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True
+        ) as process:
+            output, _ = process.communicate()
+        if process.returncode != 0:
+            print(f"ERROR: Tasker execution failed with exit code {process.returncode}")
+            print(f"OUTPUT: {output}")
             sys.exit(1)
     except Exception as e:
         print(f"ERROR: Failed to run tasker: {e}")
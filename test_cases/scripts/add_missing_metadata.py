@@ -8,42 +8,69 @@ import os
 import re
 import sys
 
-def detect_test_type(filepath, content):
-    """Detect test type based on file path and content."""
+from metadata_utils import METADATA_ENCODER, write_file_atomically
+
+# Compute test_cases directory relative to this script's location
+# Script is in test_cases/scripts/, so parent directory is test_cases/
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_CASES_DIR = os.path.dirname(SCRIPT_DIR)
+
+# Directories that never contain active tests
+SKIP_DIRS = {'logs', 'old', 'legacy', '__pycache__'}
+
+# Metadata returned by detect_test_type, shared by all files (never mutated)
+SECURITY_TEST_INFO = {
+    'test_type': 'security_negative',
+    'expected_exit_code': 20,
+    'expected_success': False,
+    'risk_level': 'high'
+}
+PERFORMANCE_TEST_INFO = {
+    'test_type': 'performance',
+    'expected_exit_code': 0,
+    'expected_success': True
+}
+VALIDATION_TEST_INFO = {
+    'test_type': 'validation_only',
+    'expected_exit_code': 20,
+    'expected_success': False
+}
+POSITIVE_TEST_INFO = {
+    'test_type': 'positive',
+    'expected_exit_code': 0,
+    'expected_success': True
+}
+
+def detect_test_type(filepath):
+    """Detect test type based on file path and naming pattern."""
     filename = os.path.basename(filepath)
-    dirname = os.path.basename(os.path.dirname(filepath))
 
     # Security tests
     if 'security' in filepath:
-        return {
-            'test_type': 'security_negative',
-            'expected_exit_code': 20,
-            'expected_success': False,
-            'risk_level': 'high'
-        }
+        return SECURITY_TEST_INFO
 
     # Timeout/stress tests typically have longer execution
     if 'timeout' in filename or 'stress' in filename:
-        return {
-            'test_type': 'performance',
-            'expected_exit_code': 0,
-            'expected_success': True
-        }
+        return PERFORMANCE_TEST_INFO
 
     # Retry validation tests
     if 'retry_validation' in filename:
-        return {
-            'test_type': 'validation_only',
-            'expected_exit_code': 20,
-            'expected_success': False
-        }
+        return VALIDATION_TEST_INFO
 
     # Most edge cases and integration tests are positive
-    return {
-        'test_type': 'positive',
-        'expected_exit_code': 0,
-        'expected_success': True
-    }
+    return POSITIVE_TEST_INFO
+
+def iter_test_files(root):
+    """Yield .txt files below root, without descending into SKIP_DIRS."""
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        pending.append(entry.path)
+                elif entry.name.endswith('.txt'):
+                    yield entry.path
 
 def generate_description(filepath):
     """Generate description from filename."""
@@ -51,17 +78,14 @@ def generate_description(filepath):
     # Capitalize first letter
     return filename[0].upper() + filename[1:]
 
-def add_metadata(filepath):
-    """Add TEST_METADATA to a test file."""
-    with open(filepath, 'r') as f:
-        content = f.read()
-
+def add_metadata(filepath, content):
+    """Add TEST_METADATA to a test file, given its current content."""
     # Skip if already has metadata
     if 'TEST_METADATA' in content:
         return False
 
     # Detect test characteristics
-    test_info = detect_test_type(filepath, content)
+    test_info = detect_test_type(filepath)
     description = generate_description(filepath)
 
     # Build metadata
@@ -72,38 +96,34 @@ def add_metadata(filepath):
     }
 
     # Format as JSON
-    import json
-    metadata_line = f"# TEST_METADATA: {json.dumps(metadata, separators=(',', ': '))}\n"
+    metadata_line = f"# TEST_METADATA: {METADATA_ENCODER.encode(metadata)}\n"
 
     # Add metadata as first line
     new_content = metadata_line + content
 
     # Write back
-    with open(filepath, 'w') as f:
-        f.write(new_content)
+    write_file_atomically(filepath, new_content)
 
     return True
 
 def main():
     """Main function."""
-    test_cases_dir = '/home/baste/tasker/test_cases'
+    # Optional directory argument, defaults to the test_cases tree of this checkout
+    test_cases_dir = sys.argv[1] if len(sys.argv) > 1 else TEST_CASES_DIR
 
     # Find all .txt files missing TEST_METADATA
-    for root, dirs, files in os.walk(test_cases_dir):
-        # Skip logs, old, legacy directories
-        dirs[:] = [d for d in dirs if d not in ['logs', 'old', 'legacy', '__pycache__']]
-
-        for filename in files:
-            if filename.endswith('.txt'):
-                filepath = os.path.join(root, filename)
-
-                # Check if missing metadata
-                with open(filepath, 'r') as f:
-                    if 'TEST_METADATA' not in f.read():
-                        if add_metadata(filepath):
-                            print(f"✅ Added metadata to: {filepath}")
-                        else:
-                            print(f"⊘ Skipped (already has metadata): {filepath}")
+    for filepath in iter_test_files(test_cases_dir):
+        with open(filepath, 'r') as f:
+            # Check if missing metadata, stopping at the line that has it
+            if any('TEST_METADATA' in line for line in f):
+                continue
+            f.seek(0)
+            content = f.read()
+
+        if add_metadata(filepath, content):
+            print(f"✅ Added metadata to: {filepath}")
+        else:
+            print(f"⊘ Skipped (already has metadata): {filepath}")
 
 if __name__ == '__main__':
     main()
@@ -4,54 +4,93 @@ Auto-fix test metadata by running tests and detecting actual behavior.
 """
 
 import os
+import glob
 import json
 import re
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from metadata_utils import METADATA_ENCODER, write_file_atomically
 
 # Compute test_cases directory relative to this script's location
 # Script is in test_cases/scripts/, so parent directory is test_cases/
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_CASES_DIR = os.path.dirname(SCRIPT_DIR)
 
-def run_test(filepath):
+# TEST_METADATA line patterns, compiled once for all files
+METADATA_PATTERN = re.compile(r'# TEST_METADATA: ({.*})')
+METADATA_LINE_PATTERN = re.compile(r'# TEST_METADATA: {.*}\n')
+
+# Test types expected to fail during validation, before any task runs
+VALIDATION_TEST_TYPES = ('validation_only', 'security_negative')
+
+# Seconds a single test may run before it is killed
+TEST_TIMEOUT = 10
+
+# Longer limits for test types that are expected to run long
+TEST_TIMEOUTS = {
+    'performance': 60
+}
+
+# Seconds allowed for a --validate-only run, which never executes tasks
+VALIDATION_TIMEOUT = 5
+
+# --validate-only runs execute no tasks and share no state, so several can run at once.
+# Full -r runs stay serial: tests share $HOME counters, recovery files and timing.
+MAX_VALIDATION_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+def run_test(filepath, validate_only=False, timeout=TEST_TIMEOUT):
     """Run a test and capture exit code and warnings."""
     cmd = [
         'python3', '../tasker.py',
-        '-r',  # RUN mode - actually execute tasks
+        # Validation only, or RUN mode - actually execute tasks
+        '--validate-only' if validate_only else '-r',
         '--skip-host-validation',
         filepath
     ]
 
+    warning_count = 0
+    is_validation_failure = False
+
     try:
+        # Merge stderr into stdout and scan it line by line instead of buffering it all
         with subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             universal_newlines=True,
             cwd=TEST_CASES_DIR
         ) as process:
-            try:
-                stdout, stderr = process.communicate(timeout=10)
-                exit_code = process.returncode
-            except subprocess.TimeoutExpired:
-                # Kill the process and reap the child to prevent hanging
+            # Kill the process if it runs too long; the loop below then sees EOF
+            timed_out = threading.Event()
+
+            def kill_on_timeout():
+                timed_out.set()
                 process.kill()
-                stdout, stderr = process.communicate()  # Reap without timeout
-                return {
-                    'exit_code': 124,
-                    'warning_count': 0,
-                    'is_validation_failure': False,
-                    'is_timeout': True,
-                    'stderr': ''
-                }
-
-        # Count warnings (check both stdout and stderr)
-        warning_count = stdout.count('WARN:') + stderr.count('WARN:')
-
-        # Check if it's a validation failure (case-insensitive, check both stdout and stderr)
-        combined_output = (stdout + stderr).lower()
-        is_validation_failure = 'validation failed' in combined_output
+
+            timer = threading.Timer(timeout, kill_on_timeout)
+            timer.start()
+            try:
+                for line in process.stdout:
+                    # Count warnings
+                    warning_count += line.count('WARN:')
+
+                    # Check if it's a validation failure (case-insensitive)
+                    if not is_validation_failure and 'validation failed' in line.lower():
+                        is_validation_failure = True
+                exit_code = process.wait()
+            finally:
+                timer.cancel()
+
+        if timed_out.is_set():
+            return {
+                'exit_code': 124,
+                'warning_count': 0,
+                'is_validation_failure': False,
+                'is_timeout': True
+            }
 
         # Check if it timed out
         is_timeout = exit_code == 124
@@ -60,25 +99,55 @@ def run_test(filepath):
             'exit_code': exit_code,
             'warning_count': warning_count,
             'is_validation_failure': is_validation_failure,
-            'is_timeout': is_timeout,
-            'stderr': stderr
+            'is_timeout': is_timeout
         }
     except Exception as e:
         print(f"ERROR running {filepath}: {e}")
         return None
 
+def read_test_type(filepath):
+    """Return the test_type from a test's metadata, or None if unavailable."""
+    try:
+        with open(filepath, 'r') as f:
+            match = METADATA_PATTERN.search(f.read())
+        return json.loads(match.group(1)).get('test_type') if match else None
+    except (OSError, ValueError):
+        return None
+
+def run_validation_probes(rel_paths, test_types):
+    """Run --validate-only concurrently for validation-failure test types.
+
+    Returns one result per test, or None where no probe was run.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_VALIDATION_WORKERS) as executor:
+        futures = [
+            executor.submit(run_test, rel_path, validate_only=True, timeout=VALIDATION_TIMEOUT)
+            if test_type in VALIDATION_TEST_TYPES else None
+            for rel_path, test_type in zip(rel_paths, test_types)
+        ]
+        return [future.result() if future else None for future in futures]
+
+def check_test(rel_path, test_type, probe_result):
+    """Use the validation probe if it still fails validation, otherwise run the test fully."""
+    # Still fails validation, so a full run would stop at the same point
+    if probe_result and probe_result['is_validation_failure'] and probe_result['exit_code'] == 20:
+        return probe_result
+
+    return run_test(rel_path, timeout=TEST_TIMEOUTS.get(test_type, TEST_TIMEOUT))
+
 def fix_metadata(filepath, test_result):
     """Fix metadata based on test results."""
     with open(filepath, 'r') as f:
         content = f.read()
 
     # Extract metadata
-    match = re.search(r'# TEST_METADATA: ({.*})', content)
+    match = METADATA_PATTERN.search(content)
     if not match:
         print(f"⊘ No metadata found in {filepath}")
         return False
 
     metadata = json.loads(match.group(1))
+    original_metadata = dict(metadata)
 
     # Determine correct metadata based on test results
     if test_result['is_validation_failure'] and test_result['exit_code'] == 20:
@@ -102,14 +171,19 @@ def fix_metadata(filepath, test_result):
         # Remove expected_warnings if no warnings found
         del metadata['expected_warnings']
 
+    # Skip the rewrite when the test still behaves as its metadata says
+    if metadata == original_metadata:
+        return False
+
     # Build new metadata line
-    new_metadata_line = f"# TEST_METADATA: {json.dumps(metadata, separators=(',', ': '))}\n"
+    new_metadata_line = f"# TEST_METADATA: {METADATA_ENCODER.encode(metadata)}\n"
 
     # Replace metadata
-    new_content = re.sub(r'# TEST_METADATA: {.*}\n', new_metadata_line, content)
+    new_content = METADATA_LINE_PATTERN.sub(new_metadata_line, content, count=1)
+    if new_content == content:
+        return False
 
-    with open(filepath, 'w') as f:
-        f.write(new_content)
+    write_file_atomically(filepath, new_content)
 
     return True
 
@@ -122,22 +196,23 @@ def main():
     test_dir = sys.argv[1]
 
     # Find all .txt files
-    test_files = []
-    for root, dirs, files in os.walk(test_dir):
-        for filename in files:
-            if filename.endswith('.txt'):
-                filepath = os.path.join(root, filename)
-                test_files.append(filepath)
+    test_files = glob.glob(os.path.join(test_dir, '**', '*.txt'), recursive=True)
 
     print(f"Found {len(test_files)} test files")
 
+    test_files.sort()
+    rel_paths = [os.path.relpath(filepath, TEST_CASES_DIR) for filepath in test_files]
+
+    test_types = [read_test_type(filepath) for filepath in test_files]
+
+    # Finish all concurrent validation probes before any test executes tasks
+    probe_results = run_validation_probes(rel_paths, test_types)
+
     fixed_count = 0
-    for filepath in sorted(test_files):
-        rel_path = os.path.relpath(filepath, TEST_CASES_DIR)
+    for filepath, rel_path, test_type, probe_result in zip(test_files, rel_paths, test_types, probe_results):
         print(f"\n Testing: {rel_path}")
 
-        # Run test
-        result = run_test(rel_path)
+        result = check_test(rel_path, test_type, probe_result)
         if result is None:
             continue
 
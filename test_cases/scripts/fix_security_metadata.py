@@ -7,20 +7,31 @@ import os
 import json
 import re
 
+from metadata_utils import METADATA_ENCODER, write_file_atomically
+
+# Compute test_cases directory relative to this script's location
+# Script is in test_cases/scripts/, so parent directory is test_cases/
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_CASES_DIR = os.path.dirname(SCRIPT_DIR)
+
+# TEST_METADATA line pattern, compiled once for all files
+METADATA_PATTERN = re.compile(r'# TEST_METADATA: ({.*})')
+
+# Filename markers and their security category, checked in priority order
+SECURITY_CATEGORIES = (
+    ('command_injection', 'command_injection'),
+    ('path_traversal', 'path_traversal'),
+    ('buffer_overflow', 'buffer_overflow'),
+    ('malformed', 'malformed_input'),
+    ('resource_exhaustion', 'resource_exhaustion'),
+)
+
 def extract_security_category(filename):
     """Extract security category from filename."""
-    if 'command_injection' in filename:
-        return 'command_injection'
-    elif 'path_traversal' in filename:
-        return 'path_traversal'
-    elif 'buffer_overflow' in filename:
-        return 'buffer_overflow'
-    elif 'malformed' in filename:
-        return 'malformed_input'
-    elif 'resource_exhaustion' in filename:
-        return 'resource_exhaustion'
-    else:
-        return 'security_violation'
+    for marker, category in SECURITY_CATEGORIES:
+        if marker in filename:
+            return category
+    return 'security_violation'
 
 def fix_security_metadata(filepath):
     """Add security_category to security test metadata."""
@@ -32,7 +43,7 @@ def fix_security_metadata(filepath):
         return False
 
     # Extract and parse metadata
-    match = re.search(r'# TEST_METADATA: ({.*})', content)
+    match = METADATA_PATTERN.search(content)
     if not match:
         return False
 
@@ -40,33 +51,38 @@ def fix_security_metadata(filepath):
 
     # Add security_category (or update if exists)
     filename = os.path.basename(filepath)
-    metadata['security_category'] = extract_security_category(filename)
+    security_category = extract_security_category(filename)
+
+    # Leave the file untouched when the category is already correct
+    if metadata.get('security_category') == security_category:
+        return False
+    metadata['security_category'] = security_category
 
     # Build new metadata line
-    new_metadata_line = f"# TEST_METADATA: {json.dumps(metadata, separators=(',', ': '))}\n"
+    new_metadata_line = f"# TEST_METADATA: {METADATA_ENCODER.encode(metadata)}\n"
 
-    # Replace old metadata line
-    new_content = re.sub(r'# TEST_METADATA: {.*}\n', new_metadata_line, content)
+    # Replace the metadata line that was parsed, up to and including its newline
+    line_end = content.find('\n', match.end())
+    line_end = len(content) if line_end == -1 else line_end + 1
+    new_content = content[:match.start()] + new_metadata_line + content[line_end:]
 
-    # Write back
-    with open(filepath, 'w') as f:
-        f.write(new_content)
+    write_file_atomically(filepath, new_content)
 
     return True
 
 def main():
     """Main function."""
-    security_dir = '/home/baste/tasker/test_cases/security'
+    security_dir = os.path.join(TEST_CASES_DIR, 'security')
 
     fixed_count = 0
-    for filename in os.listdir(security_dir):
-        if filename.endswith('.txt'):
-            filepath = os.path.join(security_dir, filename)
-            if fix_security_metadata(filepath):
-                print(f"✅ Fixed: {filename}")
-                fixed_count += 1
-            else:
-                print(f"⊘ Skipped: {filename}")
+    with os.scandir(security_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.txt') and entry.is_file():
+                if fix_security_metadata(entry.path):
+                    print(f"✅ Fixed: {entry.name}")
+                    fixed_count += 1
+                else:
+                    print(f"⊘ Skipped: {entry.name}")
 
     print(f"\n✅ Fixed {fixed_count} security test files")
 
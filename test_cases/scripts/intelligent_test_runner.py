@@ -37,6 +37,46 @@ except ImportError:
     PSUTIL_AVAILABLE = False
     # Graceful degradation - performance monitoring disabled but tests still run
 
+# Script is in test_cases/scripts/; helper scripts live in test_cases/bin/
+# Resolved once at import instead of for every test
+SCRIPT_DIR = Path(__file__).resolve().parent
+TEST_CASES_DIR = SCRIPT_DIR.parent
+TEST_BIN_DIR = TEST_CASES_DIR / "bin"
+
+# Output patterns used by TaskerTestExecutor.parse_execution_path, compiled once for all tests
+RETRY_ATTEMPT_PATTERN = re.compile(r'Task (\d+-\d+\.\d+): (?:Executing|FAILED|SUCCESS)')
+LOOP_ITERATION_PATTERN = re.compile(r'Task (\d+)\.(\d+): (?:\[DRY RUN\] Would execute|Executing)')
+SUBTASK_EXECUTING_PATTERN = re.compile(r'Task \d+-\d+: Executing')
+SUBTASK_ID_PATTERN = re.compile(r'Task (\d+-\d+):')
+# Regular, parallel, conditional (TRUE/FALSE branch) and decision task starts
+TASK_EXECUTING_PATTERN = re.compile(r'Task \d+: (?:Executing|Starting parallel execution|DECISION - Evaluating conditions)')
+TASK_ID_PATTERN = re.compile(r'Task (\d+):')
+TASK_RETURNING_PATTERN = re.compile(r'Task \d+: Returning with exit code')
+TASK_SKIPPING_PATTERN = re.compile(r'Task \d+:.*skipping task')
+JUMP_TARGET_PATTERN = re.compile(r'jumping to Task (\d+)')
+TASK_STDOUT_MARKER_PATTERN = re.compile(r'Task (\d+|\d+-\d+): STDOUT:')
+TASK_STDOUT_PATTERN = re.compile(r'Task (\d+|\d+-\d+): STDOUT: (.+)')
+TASK_STDERR_MARKER_PATTERN = re.compile(r'Task (\d+|\d+-\d+): STDERR:')
+TASK_STDERR_PATTERN = re.compile(r'Task (\d+|\d+-\d+): STDERR: (.+)')
+TASK_EXIT_CODE_PATTERN = re.compile(r'Task (\d+|\d+-\d+): Exit code: (-?\d+)')
+TASK_SUCCESS_PATTERN = re.compile(r'Task (\d+|\d+-\d+): Completed - Success: (True|False)')
+
+# Output patterns used by TestValidator, compiled once for all tests
+# TASKER's normal task logging: [DDMmmYY HH:MM:SS] Task X:
+TASK_LOG_LINE_PATTERN = re.compile(r'^\[\d{2}\w{3}\d{2} \d{2}:\d{2}:\d{2}\] Task \d+:')
+# TASKER warnings: [DDMmmYY HH:MM:SS] WARN: / WARNING: / DEBUG: # WARNING:
+WARNING_LINE_PATTERN = re.compile(r'^\[\d{2}\w{3}\d{2} \d{2}:\d{2}:\d{2}\] (WARN:|WARNING:|DEBUG: # WARNING:)')
+# Characters that give a pattern regex meaning; patterns without them are plain text
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+# Unhandled Python exception types that indicate an internal crash
+EXCEPTION_PATTERNS = (
+    "AttributeError:", "KeyError:", "TypeError:", "NameError:",
+    "IndexError:", "ImportError:", "RuntimeError:", "OSError:",
+    "FileNotFoundError:", "PermissionError:"
+)
+# All exception markers as one alternation, so output is scanned once instead of once per marker
+EXCEPTION_PATTERN = re.compile('|'.join(re.escape(pattern) for pattern in EXCEPTION_PATTERNS))
+
 
 def _resolve_tasker_path(tasker_path=None):
     """Resolve tasker executable path using PATH discovery with fallbacks."""
@@ -458,87 +498,101 @@ class TaskerTestExecutor:
         variables = {}
         output_patterns = {"stdout": [], "stderr": []}
 
+        # Sets mirroring the lists above for constant-time "already seen" checks
+        executed_task_set = set()
+        loop_iteration_set = set()
+        retry_attempt_set = set()
+        skipped_task_set = set()
+
         # Parse task execution lines
         for line in stdout_content.split('\n'):
+            # Every pattern below mentions a task, so other lines can be skipped cheaply
+            if 'Task ' not in line:
+                continue
+
             # Look for retry attempt patterns (Task 1-10.1, Task 1-10.2 format) - HIGHEST PRIORITY
             # Match patterns like "Task 1-10.1: Executing" or "Task 1-10.2: FAILED"
             # Must check before subtask pattern to avoid false matches
-            retry_match = re.search(r'Task (\d+-\d+\.\d+): (?:Executing|FAILED|SUCCESS)', line)
+            retry_match = RETRY_ATTEMPT_PATTERN.search(line)
             if retry_match:
                 retry_id = retry_match.group(1)
                 # Only add if not already in the list (avoid duplicates)
-                if retry_id not in retry_execution_path:
+                if retry_id not in retry_attempt_set:
+                    retry_attempt_set.add(retry_id)
                     retry_execution_path.append(retry_id)
                 continue
 
             # Look for loop iteration patterns (Task X.Y format) - only count execution start lines
             # Match patterns like "Task 1.1: [DRY RUN] Would execute" or "Task 1.1: Executing"
-            loop_match = re.search(r'Task (\d+)\.(\d+): (?:\[DRY RUN\] Would execute|Executing)', line)
+            loop_match = LOOP_ITERATION_PATTERN.search(line)
             if loop_match:
                 task_id = int(loop_match.group(1))
                 iteration = int(loop_match.group(2))
                 iteration_id = f"{task_id}.{iteration}"
                 # Only add if not already in the list (avoid duplicates)
-                if iteration_id not in loop_execution_path:
+                if iteration_id not in loop_iteration_set:
+                    loop_iteration_set.add(iteration_id)
                     loop_execution_path.append(iteration_id)
                 # Add base task_id to executed_tasks if not already there
-                if task_id not in executed_tasks:
+                if task_id not in executed_task_set:
+                    executed_task_set.add(task_id)
                     executed_tasks.append(task_id)
                 final_task = task_id
                 continue
 
             # Look for conditional/parallel subtask execution (e.g., Task 1-20:, Task 2-30:)
-            if re.search(r'Task \d+-\d+: Executing', line):
-                match = re.search(r'Task (\d+-\d+):', line)
+            if SUBTASK_EXECUTING_PATTERN.search(line):
+                match = SUBTASK_ID_PATTERN.search(line)
                 if match:
                     task_id = match.group(1)
                     executed_subtasks.append(task_id)
 
             # Look for task execution patterns (regular tasks, parallel, conditional, decision)
-            elif re.search(r'Task \d+: Executing', line) or \
-               re.search(r'Task \d+: Starting parallel execution', line) or \
-               re.search(r'Task \d+: Executing (TRUE|FALSE) branch', line) or \
-               re.search(r'Task \d+: DECISION - Evaluating conditions', line):
-                match = re.search(r'Task (\d+):', line)
+            elif TASK_EXECUTING_PATTERN.search(line):
+                match = TASK_ID_PATTERN.search(line)
                 if match:
                     task_id = int(match.group(1))
+                    executed_task_set.add(task_id)
                     executed_tasks.append(task_id)
                     final_task = task_id
 
             # Look for return task patterns
-            elif re.search(r'Task \d+: Returning with exit code', line):
-                match = re.search(r'Task (\d+):', line)
+            elif TASK_RETURNING_PATTERN.search(line):
+                match = TASK_ID_PATTERN.search(line)
                 if match:
                     task_id = int(match.group(1))
-                    if task_id not in executed_tasks:
+                    if task_id not in executed_task_set:
+                        executed_task_set.add(task_id)
                         executed_tasks.append(task_id)
                     final_task = task_id
 
             # Look for task skipping patterns
-            elif re.search(r'Task \d+:.*skipping task', line):
-                match = re.search(r'Task (\d+):', line)
+            elif TASK_SKIPPING_PATTERN.search(line):
+                match = TASK_ID_PATTERN.search(line)
                 if match:
                     task_id = int(match.group(1))
+                    skipped_task_set.add(task_id)
                     skipped_tasks.append(task_id)
 
             # Look for jumping patterns to infer skipped tasks
-            elif re.search(r'jumping to Task \d+', line):
-                match = re.search(r'jumping to Task (\d+)', line)
+            elif JUMP_TARGET_PATTERN.search(line):
+                match = JUMP_TARGET_PATTERN.search(line)
                 if match:
                     target_task = int(match.group(1))
                     # Find the task that's doing the jumping
-                    jump_line_match = re.search(r'Task (\d+):', line)
+                    jump_line_match = TASK_ID_PATTERN.search(line)
                     if jump_line_match:
                         current_task = int(jump_line_match.group(1))
                         # Infer skipped tasks between current and target
                         for skip_task in range(current_task + 1, target_task):
-                            if skip_task not in skipped_tasks:
+                            if skip_task not in skipped_task_set:
+                                skipped_task_set.add(skip_task)
                                 skipped_tasks.append(skip_task)
 
             # Capture task output for variable validation (Phase 3)
             # Support both regular tasks (Task 1:) and subtasks (Task 1-20:)
-            elif re.search(r'Task (\d+|\d+-\d+): STDOUT:', line):
-                match = re.search(r'Task (\d+|\d+-\d+): STDOUT: (.+)', line)
+            elif TASK_STDOUT_MARKER_PATTERN.search(line):
+                match = TASK_STDOUT_PATTERN.search(line)
                 if match:
                     task_id = match.group(1)
                     stdout_value = match.group(2)
@@ -546,8 +600,8 @@ class TaskerTestExecutor:
                     # Add to output patterns for pattern matching
                     output_patterns["stdout"].append(stdout_value)
 
-            elif re.search(r'Task (\d+|\d+-\d+): STDERR:', line):
-                match = re.search(r'Task (\d+|\d+-\d+): STDERR: (.+)', line)
+            elif TASK_STDERR_MARKER_PATTERN.search(line):
+                match = TASK_STDERR_PATTERN.search(line)
                 if match:
                     task_id = match.group(1)
                     stderr_value = match.group(2)
@@ -558,8 +612,8 @@ class TaskerTestExecutor:
             # Capture task exit codes (Phase 3 enhancement)
             # Matches both regular tasks (Task 0:) and subtasks (Task 0-1:)
             # Supports negative exit codes (signal interruptions: -15 = SIGTERM, -2 = SIGINT)
-            elif re.search(r'Task (\d+|\d+-\d+): Exit code: (-?\d+)', line):
-                match = re.search(r'Task (\d+|\d+-\d+): Exit code: (-?\d+)', line)
+            elif TASK_EXIT_CODE_PATTERN.search(line):
+                match = TASK_EXIT_CODE_PATTERN.search(line)
                 if match:
                     task_id = match.group(1)
                     exit_code = match.group(2)
@@ -570,8 +624,8 @@ class TaskerTestExecutor:
 
             # Capture explicit task success status (Phase 3 enhancement)
             # This overrides the inferred success from exit code if explicitly logged
-            elif re.search(r'Task (\d+|\d+-\d+): Completed - Success: (True|False)', line):
-                match = re.search(r'Task (\d+|\d+-\d+): Completed - Success: (True|False)', line)
+            elif TASK_SUCCESS_PATTERN.search(line):
+                match = TASK_SUCCESS_PATTERN.search(line)
                 if match:
                     task_id = match.group(1)
                     success_status = match.group(2)
@@ -601,9 +655,7 @@ class TaskerTestExecutor:
         second_signal_delay = metadata.get('second_signal_delay', 0)
 
         # Locate signal_test_wrapper.sh
-        script_dir = Path(__file__).resolve().parent  # scripts directory
-        test_cases_dir = script_dir.parent  # test_cases directory
-        wrapper_path = test_cases_dir / "bin" / "signal_test_wrapper.sh"
+        wrapper_path = TEST_BIN_DIR / "signal_test_wrapper.sh"
 
         if not wrapper_path.exists():
             return {
@@ -693,9 +745,7 @@ class TaskerTestExecutor:
         wrapper_args = metadata.get('wrapper_args', '')
 
         # Locate wrapper script in test_cases/bin/
-        script_dir = Path(__file__).resolve().parent  # scripts directory
-        test_cases_dir = script_dir.parent  # test_cases directory
-        wrapper_path = test_cases_dir / "bin" / wrapper_script
+        wrapper_path = TEST_BIN_DIR / wrapper_script
 
         if not wrapper_path.exists():
             return {
@@ -857,11 +907,8 @@ class TaskerTestExecutor:
         path_additions = []
 
         # 1. Absolute path to test_cases/bin (primary location)
-        script_dir = Path(__file__).resolve().parent  # scripts directory
-        test_cases_dir = script_dir.parent  # test_cases directory
-        main_bin_dir = test_cases_dir / "bin"
-        if main_bin_dir.exists():
-            path_additions.append(str(main_bin_dir))
+        if TEST_BIN_DIR.exists():
+            path_additions.append(str(TEST_BIN_DIR))
 
         # 2. Relative to test file's parent directory (for backward compatibility)
         test_dir = os.path.dirname(os.path.abspath(test_file))
@@ -1085,26 +1132,21 @@ class TestValidator:
         traceback_detected = any("Python traceback detected" in f for f in validation_results["failures"])
         nonzero_exit = actual_results.get("exit_code", 1) != 0
 
-        if not traceback_detected and nonzero_exit:
-            exception_patterns = [
-                "AttributeError:", "KeyError:", "TypeError:", "NameError:",
-                "IndexError:", "ImportError:", "RuntimeError:", "OSError:",
-                "FileNotFoundError:", "PermissionError:"
-            ]
-
+        # Only split into lines when some exception marker appears at all
+        if not traceback_detected and nonzero_exit and EXCEPTION_PATTERN.search(combined_output):
             for line in combined_output.split('\n'):
+                # Check for exception patterns
+                if not EXCEPTION_PATTERN.search(line):
+                    continue
+
                 # Skip if it's part of TASKER's normal logging (Task X: output)
-                if re.match(r'^\[\d{2}\w{3}\d{2} \d{2}:\d{2}:\d{2}\] Task \d+:', line):
+                if TASK_LOG_LINE_PATTERN.match(line):
                     continue
 
-                # Check for exception patterns
-                for exception_pattern in exception_patterns:
-                    if exception_pattern in line:
-                        validation_results["passed"] = False
-                        validation_results["failures"].append(
-                            f"INTERNAL ERROR: Unhandled Python exception detected: {line.strip()}"
-                        )
-                        break
+                validation_results["passed"] = False
+                validation_results["failures"].append(
+                    f"INTERNAL ERROR: Unhandled Python exception detected: {line.strip()}"
+                )
 
         # Validate exit code (supports single value or list of acceptable values)
         if "expected_exit_code" in metadata:
@@ -1266,6 +1308,24 @@ class TestValidator:
                             f"Expected stderr pattern '{pattern}' not found"
                         )
 
+        # Validate required/forbidden output text (unlike the checks above, a mismatch fails the test)
+        if "required_output_patterns" in metadata or "forbidden_output_patterns" in metadata:
+            combined_output = actual_results["stdout"] + "\n" + actual_results["stderr"]
+
+            for pattern in metadata.get("required_output_patterns", []):
+                if pattern not in combined_output:
+                    validation_results["passed"] = False
+                    validation_results["failures"].append(
+                        f"Required output pattern '{pattern}' not found"
+                    )
+
+            for pattern in metadata.get("forbidden_output_patterns", []):
+                if pattern in combined_output:
+                    validation_results["passed"] = False
+                    validation_results["failures"].append(
+                        f"Forbidden output pattern '{pattern}' found"
+                    )
+
         # Special handling for negative tests
         if metadata.get("test_type") == "negative":
             if actual_results["exit_code"] == 0:
@@ -1296,10 +1356,11 @@ class TestValidator:
             # Validate security error patterns
             if "expected_error_patterns" in metadata:
                 error_patterns = metadata["expected_error_patterns"]
-                combined_output = actual_results["stdout"] + " " + actual_results["stderr"]
+                # Lowercase the combined output once, not once per pattern
+                combined_output_lower = (actual_results["stdout"] + " " + actual_results["stderr"]).lower()
 
                 for pattern in error_patterns:
-                    if pattern.lower() not in combined_output.lower():
+                    if pattern.lower() not in combined_output_lower:
                         validation_results["warnings"].append(
                             f"Expected security error pattern '{pattern}' not found in output"
                         )
@@ -1455,31 +1516,37 @@ class TestValidator:
         # Only count actual TASKER warnings with timestamp format: [DDMmmYY HH:MM:SS] WARN: or DEBUG: # WARNING:
         # This excludes task output that happens to contain "WARNING:" text
         # Pattern: [08Oct25 23:46:06] WARN: or [08Oct25 23:46:06] WARNING: or [08Oct25 23:46:06] DEBUG: # WARNING:
-        warning_pattern = re.compile(r'^\[\d{2}\w{3}\d{2} \d{2}:\d{2}:\d{2}\] (WARN:|WARNING:|DEBUG: # WARNING:)')
         warning_lines = [line for line in actual_results["stdout"].split('\n')
-                       if warning_pattern.match(line)]
+                       if WARNING_LINE_PATTERN.match(line)]
 
         # TEST-SPECIFIC ACCEPTABLE WARNINGS: Extract from metadata (if present)
         # These warnings may occur due to timing/load but are acceptable for this specific test
         # Format in metadata: "acceptable_warnings": ["pattern1", "pattern2", ...]
         acceptable_warnings = metadata.get("acceptable_warnings", [])
 
+        # Compile acceptable patterns once rather than per warning line
+        # Treat patterns as regex; fall back to literal if invalid
+        acceptable_regexes = []
+        acceptable_literals = []
+        for acceptable_pattern in acceptable_warnings:
+            # Plain ASCII text needs no regex engine - a lowercase substring test is equivalent
+            if all(ord(char) < 128 for char in acceptable_pattern) and not REGEX_METACHARACTERS.intersection(acceptable_pattern):
+                acceptable_literals.append(acceptable_pattern.lower())
+                continue
+            try:
+                acceptable_regexes.append(re.compile(acceptable_pattern, re.IGNORECASE))
+            except re.error:
+                # Invalid regex - fall back to case-insensitive substring match
+                acceptable_literals.append(acceptable_pattern.lower())
+
         # Filter out acceptable warnings before counting (test-specific)
         # Supports both regex patterns and literal strings with case-insensitive matching
         non_acceptable_warnings = []
         for warning_line in warning_lines:
-            is_acceptable = False
-            for acceptable_pattern in acceptable_warnings:
-                # Treat patterns as regex; fall back to literal if invalid
-                try:
-                    if re.search(acceptable_pattern, warning_line, re.IGNORECASE):
-                        is_acceptable = True
-                        break
-                except re.error:
-                    # Invalid regex - fall back to case-insensitive substring match
-                    if acceptable_pattern.lower() in warning_line.lower():
-                        is_acceptable = True
-                        break
+            is_acceptable = any(regex.search(warning_line) for regex in acceptable_regexes)
+            if not is_acceptable and acceptable_literals:
+                warning_line_lower = warning_line.lower()
+                is_acceptable = any(literal in warning_line_lower for literal in acceptable_literals)
             if not is_acceptable:
                 non_acceptable_warnings.append(warning_line)
 
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the TEST_METADATA maintenance scripts.
+"""
+
+import json
+import os
+
+# Encoder for TEST_METADATA lines, created once and reused for every file
+METADATA_ENCODER = json.JSONEncoder(separators=(',', ': '))
+
+
+def write_file_atomically(path, content):
+    """Write content via a temp file and rename, so an interrupted run never leaves a truncated test."""
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise